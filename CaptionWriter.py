@@ -0,0 +1,124 @@
+import math
+import os
+import pathlib
+import time
+import FileOperations
+
+
+class CaptionWriter:
+    # region Properties
+    text_file: pathlib.Path
+    caption_file: pathlib.Path
+    cue_count: int
+    line_count: int
+    # endregion
+
+    # region Initialise
+    def __init__(self, text_file: pathlib.Path, caption_file: pathlib.Path, flush_interval=5.0,
+                 buffer_size=64*1024):
+        self.text_file = FileOperations.absolute_path(text_file)
+        self.caption_file = FileOperations.absolute_path(caption_file)
+        self.__text_part = self.__part_file(self.text_file)
+        self.__caption_part = self.__part_file(self.caption_file)
+        self.__flush_interval = flush_interval
+
+        # Open Partial Files (Renamed to destination on close)
+        FileOperations.check_directory(self.text_file)
+        FileOperations.check_directory(self.caption_file)
+        self.__text = open(self.__text_part, 'w', encoding='utf-8', buffering=buffer_size)
+        self.__caption = open(self.__caption_part, 'w', encoding='utf-8', buffering=buffer_size)
+        self.__last_flush = time.monotonic()
+
+        self.cue_count = 0
+        self.line_count = 0
+    # endregion
+
+    # Partial File Path
+    @staticmethod
+    def __part_file(file: pathlib.Path) -> pathlib.Path:
+        return file.with_name(file.name + ".part")
+
+    # Timecode Converter
+    @staticmethod
+    def timecode_converter(seconds):
+        # Milliseconds
+        milliseconds = math.floor(seconds % 1 * 1000)
+        seconds = math.floor(seconds)
+
+        # Minutes
+        minutes = math.floor(seconds / 60)
+        seconds %= 60
+
+        # Hours
+        hours = math.floor(minutes / 60)
+        minutes %= 60
+
+        return hours, minutes, seconds, milliseconds
+
+    # region Write
+    # Write Segment
+    def write(self, start: float, end: float, caption: str) -> None:
+        """ Append caption as text line, and as numbered cue if not empty. Start and end in seconds """
+        # Write Text Line
+        if self.line_count > 0:
+            self.__text.write('\n')
+        self.__text.write(caption)
+        self.line_count += 1
+
+        # Write Cue only if there is caption
+        if caption != "" and caption != "......":
+            start_h, start_m, start_s, start_ms = self.timecode_converter(start)
+            end_h, end_m, end_s, end_ms = self.timecode_converter(end)
+
+            timecode = "{0:02d}:{1:02d}:{2:02d},{3:03d} --> {4:02d}:{5:02d}:{6:02d},{7:03d}".format(
+                start_h, start_m, start_s, start_ms, end_h, end_m, end_s, end_ms)
+
+            if self.cue_count > 0:
+                self.__caption.write('\n')
+            self.cue_count += 1
+            self.__caption.write("{0}\n{1}\n{2}\n".format(self.cue_count, timecode, caption))
+
+        # Flush Periodically
+        if time.monotonic() - self.__last_flush >= self.__flush_interval:
+            self.flush()
+
+    # Flush Files
+    def flush(self) -> None:
+        self.__text.flush()
+        self.__caption.flush()
+        self.__last_flush = time.monotonic()
+    # endregion
+
+    # region Close
+    # Close and Rename to Destination
+    def close(self) -> None:
+        """ Close files and rename partial files to destination. Nothing is written if no line written """
+        self.__text.close()
+        self.__caption.close()
+
+        if self.line_count > 0:
+            os.replace(self.__text_part, self.text_file)
+            os.replace(self.__caption_part, self.caption_file)
+        else:
+            self.__remove_parts()
+
+    # Close and Keep Partial Files (Such as on crash, partial output stays usable)
+    def close_partial(self) -> None:
+        """ Close files, partial files are kept as written """
+        self.__text.close()
+        self.__caption.close()
+
+    # Close and Discard
+    def discard(self) -> None:
+        """ Close files and remove partial files """
+        self.__text.close()
+        self.__caption.close()
+        self.__remove_parts()
+
+    def __remove_parts(self):
+        for file in (self.__text_part, self.__caption_part):
+            try:
+                file.unlink()
+            except FileNotFoundError:
+                pass
+    # endregion
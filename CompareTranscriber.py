@@ -0,0 +1,70 @@
+import argparse
+import time
+import librosa
+import numpy as np
+from Transcriber import Transcriber
+
+
+# Word Error Rate (Word level edit distance over reference length)
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    reference = reference.lower().split()
+    hypothesis = hypothesis.lower().split()
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    distance = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        previous, distance[0] = distance[0], i
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current = min(distance[j] + 1, distance[j - 1] + 1, previous + (ref_word != hyp_word))
+            previous, distance[j] = distance[j], current
+
+    return distance[-1] / len(reference)
+
+
+# Compare Devices and Decoding Profiles on Given Audio Files
+def compare(files, model="English", baseline="cpu", candidates=("cpu_int8",), profiles=("balanced",)):
+    """
+    Transcribe files with baseline and candidate devices under each profile, print latency and real time factor.
+    WER of candidates is measured against baseline transcription under first profile
+    """
+    audios = [librosa.load(file, sr=Transcriber.sample_rate, mono=True, dtype=np.float32)[0] for file in files]
+    duration = sum(len(audio) for audio in audios) / Transcriber.sample_rate
+
+    results = {}
+    for device in (baseline,) + tuple(candidates):
+        # Load Model
+        start_time = time.perf_counter()
+        transcriber = Transcriber(model, device)
+        load_time = time.perf_counter() - start_time
+        print("[{0}] Load: {1:.2f} s".format(device, load_time))
+
+        # Transcribe under each profile
+        for profile in profiles:
+            start_time = time.perf_counter()
+            texts = [transcriber.transcribe(audio, profile=profile) for audio in audios]
+            used_time = time.perf_counter() - start_time
+
+            results[device, profile] = texts
+            print("[{0}, {1}] Transcribe: {2:.2f} s, Real Time Factor: {3:.3f}".format(
+                device, profile, used_time, used_time / duration))
+
+    # Accuracy Against Baseline
+    reference = results[baseline, profiles[0]]
+    for (device, profile), texts in results.items():
+        if (device, profile) == (baseline, profiles[0]):
+            continue
+        wer = np.mean([word_error_rate(ref, hyp) for ref, hyp in zip(reference, texts)])
+        print("[{0}, {1}] WER against {2}, {3}: {4:.2%}".format(device, profile, baseline, profiles[0], wer))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare accuracy and latency of Transcriber devices")
+    parser.add_argument("files", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--model", default="English", choices=Transcriber.model_choice.keys())
+    parser.add_argument("--baseline", default="cpu", choices=Transcriber.device_choice.keys())
+    parser.add_argument("--candidates", nargs="+", default=["cpu_int8"], choices=Transcriber.device_choice.keys())
+    parser.add_argument("--profiles", nargs="+", default=["balanced"], choices=Transcriber.profile_choice.keys())
+    args = parser.parse_args()
+
+    compare(args.files, args.model, args.baseline, args.candidates, args.profiles)
@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Optional
+import time
+
+
+class DegradationPolicy:
+    # region Properties
+    budget: float
+    profiles: tuple
+    current: str
+    # endregion
+
+    # region Initialise
+    def __init__(self, budget: float, base_profile="balanced", profiles=("accurate", "balanced", "fast"),
+                 history=5, recover_ratio=0.7):
+        """
+        Choose decoding profile of queued jobs to finish within budget (Seconds from start).
+        Profiles are ordered from most accurate to cheapest, never more accurate than base profile
+        """
+        self.budget = budget
+        self.profiles = tuple(profiles[profiles.index(base_profile):]) if base_profile in profiles else (base_profile,)
+        self.current = self.profiles[0]
+        self.__recover_ratio = recover_ratio  # Switch back only if projection within this part of time left
+        self.__speeds = {profile: deque(maxlen=history) for profile in self.profiles}  # Recent real time factors
+        self.__start_time = time.monotonic()
+    # endregion
+
+    # region Measure
+    # Record Real Time Factor of Completed Job
+    def record(self, profile: str, real_time_factor: Optional[float]) -> None:
+        if real_time_factor is not None and profile in self.__speeds:
+            self.__speeds[profile].append(real_time_factor)
+
+    # Estimated Real Time Factor (Measured, else scaled from nearest measured profile)
+    def __speed(self, profile):
+        if self.__speeds[profile]:
+            return sum(self.__speeds[profile]) / len(self.__speeds[profile])
+
+        # Unmeasured profile, assume no faster than any measured more accurate profile
+        for other in reversed(self.profiles[:self.profiles.index(profile)]):
+            if self.__speeds[other]:
+                return sum(self.__speeds[other]) / len(self.__speeds[other])
+        return None
+    # endregion
+
+    # Select Profile for Next Job
+    def select(self, remaining_duration: float, workers=1) -> Optional[str]:
+        """
+        Select profile by projected finish time of remaining audio (Seconds, including next job),
+        transcribed by given number of concurrent workers. Return new profile if switched, else None
+        """
+        time_left = self.budget - (time.monotonic() - self.__start_time)
+
+        # Most accurate profile projected within time left (Stricter when switching back)
+        selected = self.profiles[-1]
+        for profile in self.profiles:
+            speed = self.__speed(profile)
+            limit = time_left if self.profiles.index(profile) >= self.profiles.index(self.current) \
+                else time_left * self.__recover_ratio
+            if speed is None or remaining_duration * speed / workers <= limit:
+                selected = profile
+                break
+
+        if selected == self.current:
+            return None
+        self.current = selected
+        return selected
+
+    # Projected Finish Time of Remaining Audio under Current Profile
+    def projection(self, remaining_duration: float, workers=1) -> Optional[float]:
+        speed = self.__speed(self.current)
+        if speed is None:
+            return None
+        return remaining_duration * speed / workers
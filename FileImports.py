@@ -1,6 +1,6 @@
 import pathlib
 from proglog import ProgressBarLogger
-from typing import Optional
+from typing import Callable, Optional
 from pydub import AudioSegment
 from moviepy.editor import *
 import FileOperations
@@ -13,6 +13,7 @@ class FileImport:
     output: pathlib.Path
     percentage: float
     sound_conversion: bool
+    progress_callback: Optional[Callable[[], None]]
     # endregion
 
     # region INIT
@@ -34,8 +35,16 @@ class FileImport:
         self.percentage = 0
         self.sound_conversion = False
         self.output = FileOperations.filename_combiner(self.__des_path, self.__filename, "wav")
+        self.progress_callback = None  # Called in job thread when progress changes
     # endregion
 
+    # Set Progress (Notify callback if changed)
+    def set_percentage(self, percentage):
+        if percentage != self.percentage:
+            self.percentage = percentage
+            if self.progress_callback is not None:
+                self.progress_callback()
+
     # region Convert Audio (Backend)
     def __convert_mp3(self):
         self.__sound = AudioSegment.from_mp3(self.__source)
@@ -91,9 +100,12 @@ class FileImport:
                 self.exception = InvalidAudioException("File Type Not Supported!")
                 raise InvalidAudioException("File Type Not Supported!")
 
+        # Sound conversion progress by stage (Decoded, then exported)
         if sound_converted:
             self.sound_conversion = True
+            self.set_percentage(0.5)
             self.__sound.export(self.output, format="wav")
+        self.set_percentage(1)
 
         self.__output_log()
         self.completed = True
@@ -141,4 +153,4 @@ class CustomLogger(ProgressBarLogger):
             percent_complete = 1
 
         # Update into Target Object
-        self.obj.percentage = percent_complete
+        self.obj.set_percentage(percent_complete)
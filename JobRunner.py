@@ -0,0 +1,68 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+
+class JobRunner:
+    # region Properties
+    running: int
+    # endregion
+
+    # region Initialise
+    def __init__(self, workers=1):
+        """
+        Run jobs in worker threads. Waiting thread is woken as soon as a job finishes, reports progress
+        or on interrupt, instead of polling job state
+        """
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+        self.__condition = threading.Condition()
+        self.__finished = deque()  # (Job, Future) finished and not yet collected
+        self.__interrupted = False
+        self.__progressed = False
+        self.running = 0
+    # endregion
+
+    # region Jobs
+    # Submit Job (Job is returned with its future when finished)
+    def submit(self, job, function: Callable) -> Future:
+        with self.__condition:
+            self.running += 1
+        future = self.__executor.submit(function)
+        future.add_done_callback(lambda done: self.__on_finished(job, done))
+        return future
+
+    # Completion Callback (Called in worker thread)
+    def __on_finished(self, job, future: Future):
+        with self.__condition:
+            self.running -= 1
+            self.__finished.append((job, future))
+            self.__condition.notify_all()
+
+    # Progress Callback (Called in worker thread, updates since last wait are merged)
+    def notify_progress(self) -> None:
+        with self.__condition:
+            self.__progressed = True
+            self.__condition.notify_all()
+
+    # Wait for Finished Jobs
+    def wait(self, timeout: Optional[float] = None) -> List[Tuple[object, Future]]:
+        """ Wait until a job finishes or reports progress, interrupt or timeout. Return finished jobs and futures """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__finished or self.__interrupted or self.__progressed, timeout)
+            self.__interrupted = False
+            self.__progressed = False
+            finished = list(self.__finished)
+            self.__finished.clear()
+            return finished
+
+    # Wake Waiting Thread (Such as on cancel)
+    def interrupt(self) -> None:
+        with self.__condition:
+            self.__interrupted = True
+            self.__condition.notify_all()
+
+    # Stop Worker Threads
+    def shutdown(self, wait=True) -> None:
+        self.__executor.shutdown(wait=wait)
+    # endregion
@@ -0,0 +1,84 @@
+import itertools
+import queue
+import threading
+from typing import Optional
+
+
+class JobScheduler:
+    POLICIES = ("sjf", "fifo", "priority")
+
+    # region Properties
+    policy: str
+    unfinished_tasks: int
+    # endregion
+
+    # region Initialise
+    def __init__(self, policy="sjf", max_skips=8):
+        """
+        Job queue ordered by policy: Shortest job first (By audio duration), first in first out,
+        or explicit priority (Higher first, then shortest). A job passed over max_skips times is dispatched next
+        """
+        if policy.lower() not in self.POLICIES:
+            raise ValueError("Unknown scheduling policy: {}".format(policy))
+        self.policy = policy.lower()
+        self.__max_skips = max_skips
+
+        self.__jobs = []  # [Order, Priority, Duration, Skips, Item]
+        self.__order = itertools.count()
+        self.__condition = threading.Condition()
+        self.unfinished_tasks = 0
+    # endregion
+
+    def __len__(self):
+        return len(self.__jobs)
+
+    # Sort Key of Job (Unknown duration sorted last)
+    def __key(self, job):
+        order, priority, duration, _, _ = job
+        duration = float('inf') if duration is None else duration
+        if self.policy == "sjf":
+            return duration, order
+        if self.policy == "priority":
+            return -priority, duration, order
+        return (order,)
+
+    # region Queue
+    # Add Job
+    def put(self, item, duration: Optional[float] = None, priority=0) -> None:
+        with self.__condition:
+            self.__jobs.append([next(self.__order), priority, duration, 0, item])
+            self.unfinished_tasks += 1
+            self.__condition.notify()
+
+    # Get Next Job
+    def get(self, block=True, timeout: Optional[float] = None):
+        """ Remove and return next job, raise queue.Empty if no job within timeout """
+        with self.__condition:
+            if block and not self.__condition.wait_for(lambda: self.__jobs, timeout):
+                raise queue.Empty
+            if not self.__jobs:
+                raise queue.Empty
+
+            # Starved job first (Oldest), else by policy
+            starved = [job for job in self.__jobs if job[3] >= self.__max_skips]
+            if starved:
+                selected = min(starved, key=lambda job: job[0])
+            else:
+                selected = min(self.__jobs, key=self.__key)
+            self.__jobs.remove(selected)
+
+            # Older jobs passed over
+            for job in self.__jobs:
+                if job[0] < selected[0]:
+                    job[3] += 1
+
+            return selected[4]
+
+    # Mark Job Done
+    def task_done(self) -> None:
+        with self.__condition:
+            if self.unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self.unfinished_tasks -= 1
+            self.__condition.notify_all()
+    # endregion
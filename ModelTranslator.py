@@ -1,6 +1,7 @@
-import pickle
 from pathlib import Path
 from ExperimentalTranslator import ExperimentalTranslator
+from TokenBatcher import TokenBatcher
+import ModelWeights
 
 MODEL_CHOICES = {
     "English-Malay": ("model\\en_ms\\", False),
@@ -11,8 +12,9 @@ MODEL_CHOICES = {
 
 
 class ModelTranslator:
-    def __init__(self, model_choice):
+    def __init__(self, model_choice, batch_size=16, token_budget=2048):
         model_path, self.__experimental = MODEL_CHOICES[model_choice]
+        self.batcher = TokenBatcher(token_budget, batch_size)  # Length bucketed batches, at most batch size
         if not self.__experimental:
             self.__model = self.__load_file(Path(model_path + "\\model_output.model"))
             self.__tokenizer = self.__load_file(Path(model_path + "\\model_output.tokenizer"))
@@ -26,31 +28,45 @@ class ModelTranslator:
 
     @staticmethod
     def __load_file(file_path: Path):
-        with open(file_path, 'rb') as file:
-            obj = pickle.load(file)
-        return obj
+        # Load converted weights (Memory mapped) if available, else pickled object
+        return ModelWeights.load_model(file_path)
+
+    @staticmethod
+    def __generate(model, tokenizer, sentences):
+        # Generate for batch of sentences (Padded to longest)
+        tokenized = tokenizer(sentences, return_tensors="pt", padding=True)
+        generated = model.generate(**tokenized)
+        return tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+    # Padding Waste of Batches so far
+    @property
+    def padding_waste(self) -> float:
+        return self.batcher.padding_waste
 
     def translate(self, sentences):
         # Convert to List if is string
         is_str = type(sentences) is str
+        if is_str:
+            sentences = [sentences]
+        sentences = list(sentences)
 
-        # Translate
+        # Translate by length bucketed batches, restored to original order
+        result = [""] * len(sentences)
         if not self.__experimental:
-            if is_str:
-                sentences = [sentences]
-
-            result = []
-            for text in sentences:
-                tokenized = self.__inter_tokenizer([text], return_tensors="pt")
-                intermediate = self.__inter_model.generate(**tokenized)
-                intermediate = [self.__inter_tokenizer.decode(x, skip_special_tokens=True) for x in intermediate][0]
-                tokenized = self.__tokenizer([intermediate], return_tensors="pt")
-                translated = self.__model.generate(**tokenized)
-                result.append([self.__tokenizer.decode(x, skip_special_tokens=True) for x in translated][0])
-
-            if is_str:
-                result = result[0]
+            # Through intermediate model then output model
+            lengths = [len(ids) for ids in self.__inter_tokenizer(sentences)["input_ids"]]
+            for batch in self.batcher.batches(lengths):
+                intermediate = self.__generate(self.__inter_model, self.__inter_tokenizer,
+                                               [sentences[index] for index in batch])
+                for index, text in zip(batch, self.__generate(self.__model, self.__tokenizer, intermediate)):
+                    result[index] = text
         else:
-            result = self.__model.translate(sentences)
+            # Model input is padded to fixed length
+            lengths = [len(sequence) for sequence in self.__model.src_tokenizer.texts_to_sequences(sentences)]
+            for batch in self.batcher.batches(lengths, self.__model.pad_len):
+                for index, text in zip(batch, self.__model.translate([sentences[index] for index in batch])):
+                    result[index] = text
 
+        if is_str:
+            result = result[0]
         return result
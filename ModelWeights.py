@@ -0,0 +1,171 @@
+import dataclasses
+import json
+import pathlib
+import pickle
+from typing import Union
+import torch
+
+CONFIG_FILE = "config.json"
+WEIGHTS_FILE = "weights.pt"
+
+
+# Converted Weights Directory
+def converted_path(model_file: Union[str, pathlib.Path]) -> pathlib.Path:
+    """ Directory of converted weights for the given pickled model file (sr_en_cpu.model -> sr_en_cpu_model) """
+    model_file = pathlib.Path(model_file)
+    return model_file.parent / "{0}_{1}".format(model_file.stem, model_file.suffix[1:])
+
+
+# Check for Converted Weights
+def is_converted(model_file: Union[str, pathlib.Path]) -> bool:
+    """ Check if the given pickled model file has been converted to config and weights """
+    path = converted_path(model_file)
+    return (path / CONFIG_FILE).is_file() and (path / WEIGHTS_FILE).is_file()
+
+
+# region Save
+def save_weights(model: torch.nn.Module, model_file: Union[str, pathlib.Path]) -> pathlib.Path:
+    """
+    Save model as config and state dict beside the given pickled model file.
+    Supports Whisper speech recognition models and Transformers translation models.
+    Return directory of converted weights
+    """
+    path = converted_path(model_file)
+    path.mkdir(parents=True, exist_ok=True)
+
+    state_dict = {key: value.cpu() for key, value in model.state_dict().items()}
+
+    # Whisper
+    if hasattr(model, "dims"):
+        config = {"type": "whisper", "dims": dataclasses.asdict(model.dims)}
+        state_dict["alignment_heads"] = model.alignment_heads.to_dense().cpu()  # Not in state dict
+
+    # Transformers
+    else:
+        config = {"type": "transformers", "config": model.config.to_dict()}
+
+    with open(path / CONFIG_FILE, 'w', encoding='utf-8') as file:
+        json.dump(config, file, indent=2)
+    torch.save(state_dict, path / WEIGHTS_FILE)
+
+    return path
+# endregion
+
+
+# region Load
+def _build_whisper(config: dict) -> torch.nn.Module:
+    from whisper.model import Whisper, ModelDimensions, AudioEncoder, TextDecoder
+    dims = ModelDimensions(**config["dims"])
+
+    # Build encoder and decoder without allocating weights
+    model = Whisper.__new__(Whisper)
+    torch.nn.Module.__init__(model)
+    model.dims = dims
+    with torch.device("meta"):
+        model.encoder = AudioEncoder(dims.n_mels, dims.n_audio_ctx, dims.n_audio_state, dims.n_audio_head,
+                                     dims.n_audio_layer)
+        model.decoder = TextDecoder(dims.n_vocab, dims.n_text_ctx, dims.n_text_state, dims.n_text_head,
+                                    dims.n_text_layer)
+
+    # Default alignment heads on CPU (Sparse tensor unsupported on meta device), replaced by saved heads
+    all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+    all_heads[dims.n_text_layer // 2:] = True
+    model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+    return model
+
+
+def _restore_whisper_buffers(model: torch.nn.Module) -> None:
+    # Non persistent causal mask is not in state dict, so still on meta device after assign
+    n_ctx = model.dims.n_text_ctx
+    mask = torch.empty(n_ctx, n_ctx).fill_(float("-inf")).triu_(1)
+    model.decoder.register_buffer("mask", mask, persistent=False)
+
+
+def _build_transformers(config: dict) -> torch.nn.Module:
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+
+    # Build without allocating weights
+    with torch.device("meta"):
+        return AutoModelForSeq2SeqLM.from_config(AutoConfig.for_model(**config["config"]))
+
+
+def load_weights(model_file: Union[str, pathlib.Path], device="cpu") -> torch.nn.Module:
+    """
+    Load converted weights of the given pickled model file.
+    Weights are memory mapped on CPU, so loading is fast and pages are shared between processes
+    """
+    path = converted_path(model_file)
+    with open(path / CONFIG_FILE, 'r', encoding='utf-8') as file:
+        config = json.load(file)
+
+    state_dict = torch.load(path / WEIGHTS_FILE, map_location="cpu", mmap=True, weights_only=True)
+
+    if config["type"] == "whisper":
+        alignment_heads = state_dict.pop("alignment_heads", None)
+        model = _build_whisper(config)
+        model.load_state_dict(state_dict, assign=True)
+        _restore_whisper_buffers(model)
+        if alignment_heads is not None:
+            model.register_buffer("alignment_heads", alignment_heads.to_sparse(), persistent=False)
+    else:
+        model = _build_transformers(config)
+        model.load_state_dict(state_dict, assign=True)
+        model.tie_weights()
+
+    # Every tensor must be loaded from weights or rebuilt
+    missing = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+               if tensor.is_meta]
+    if missing:
+        raise RuntimeError("Tensors not loaded from {0}: {1}".format(path, ", ".join(missing)))
+
+    model.eval()
+    if device != "cpu":
+        model = model.to(device)
+
+    return model
+
+
+def load_model(model_file: Union[str, pathlib.Path], device="cpu"):
+    """ Load converted weights of the given model file if available, else fall back to pickled model """
+    if is_converted(model_file):
+        return load_weights(model_file, device)
+
+    with open(model_file, 'rb') as file:
+        return pickle.load(file)
+# endregion
+
+
+# Dynamic Quantization
+def quantize_dynamic(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Quantize Linear layers of the given CPU model to int8 with dynamic activation quantization.
+    Subclasses of Linear (Such as Whisper Linear, which only casts dtype) are quantized as Linear
+    """
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+
+    return torch.quantization.quantize_dynamic(model.float().eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# Convert Model Directory
+def convert_directory(path: Union[str, pathlib.Path] = "model", print_msg=True) -> None:
+    """ Convert every pickled PyTorch model (*.model) in the given directory to config and weights """
+    for model_file in sorted(pathlib.Path(path).rglob("*.model")):
+        if not model_file.is_file():
+            continue
+
+        with open(model_file, 'rb') as file:
+            model = pickle.load(file)
+
+        # Skip non PyTorch models
+        if not isinstance(model, torch.nn.Module):
+            continue
+
+        converted = save_weights(model, model_file)
+        if print_msg:
+            print("Converted: {0} -> {1}".format(model_file, converted))
+
+
+if __name__ == "__main__":
+    convert_directory()
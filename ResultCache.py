@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from typing import Optional
+import FileOperations
+
+
+class ResultCache:
+    # region Properties
+    hits: int
+    misses: int
+    # endregion
+
+    # region Initialise
+    def __init__(self, path: pathlib.Path, max_size=1024*1024*1024):
+        self.__path = FileOperations.check_directory(path)
+        self.__stats_file = self.__path / "stats.json"
+        self.__max_size = max_size
+        self.__size = None  # Total size of entries, counted on first put
+        self.__lock = threading.Lock()
+
+        # Load Statistics
+        try:
+            with open(self.__stats_file, 'r', encoding='utf-8') as file:
+                stats = json.load(file)
+            self.hits = stats.get('hits', 0)
+            self.misses = stats.get('misses', 0)
+        except (FileNotFoundError, ValueError):
+            self.hits = 0
+            self.misses = 0
+    # endregion
+
+    # Make Key
+    @staticmethod
+    def make_key(*parts) -> str:
+        """ Combine given parts into a key """
+        return hashlib.sha256("\0".join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+    # Hit Rate
+    @property
+    def hit_rate(self) -> float:
+        try:
+            return self.hits / (self.hits + self.misses)
+        except ZeroDivisionError:
+            return 0
+
+    # region Get and Put
+    # Get Cached Value
+    def get(self, key: str) -> Optional[dict]:
+        """ Get cached value of the key, None if not cached. Mark as recently used if found """
+        entry = self.__path / "{}.json".format(key)
+        with self.__lock:
+            try:
+                with open(entry, 'r', encoding='utf-8') as file:
+                    value = json.load(file)
+                os.utime(entry)  # Recently Used
+                self.hits += 1
+            except (FileNotFoundError, ValueError):
+                value = None
+                self.misses += 1
+
+        return value
+
+    # Put Value into Cache
+    def put(self, key: str, value: dict) -> None:
+        """ Cache the value of the key, least recently used entries are removed if exceed max size """
+        entry = self.__path / "{}.json".format(key)
+        temp_entry = self.__path / "{}.tmp".format(key)
+        with self.__lock:
+            if self.__size is None:
+                self.__size = sum(stat.st_size for _, stat in self.__entries())
+            if entry.is_file():
+                self.__size -= entry.stat().st_size
+
+            with open(temp_entry, 'w', encoding='utf-8') as file:
+                json.dump(value, file)
+            os.replace(temp_entry, entry)
+            self.__size += entry.stat().st_size
+
+            # Evict only when exceed max size
+            if self.__size > self.__max_size:
+                self.__evict()
+    # endregion
+
+    # region Maintenance
+    # List Entries with File Stats
+    def __entries(self):
+        return [(entry, entry.stat()) for entry in self.__path.glob("*.json") if entry != self.__stats_file]
+
+    # Remove Least Recently Used Entries
+    def __evict(self):
+        entries = self.__entries()
+        self.__size = sum(stat.st_size for _, stat in entries)
+
+        # Remove oldest used first, down to 90% of max size to avoid evicting on every put
+        entries.sort(key=lambda item: item[1].st_mtime)
+        while self.__size > self.__max_size * 0.9 and entries:
+            entry, stat = entries.pop(0)
+            try:
+                entry.unlink()
+                self.__size -= stat.st_size
+            except (FileNotFoundError, PermissionError):
+                pass
+
+    # Save Statistics
+    def save_stats(self) -> None:
+        """ Save hit and miss counters into cache directory """
+        with self.__lock:
+            self.__write_stats()
+
+    # Write Statistics
+    def __write_stats(self):
+        try:
+            with open(self.__stats_file, 'w', encoding='utf-8') as file:
+                json.dump({'hits': self.hits, 'misses': self.misses}, file)
+        except PermissionError:
+            pass
+
+    # Clear Cache
+    def clear(self) -> None:
+        with self.__lock:
+            FileOperations.remove_files(self.__path, "*.json")
+            self.__size = 0
+            self.hits = 0
+            self.misses = 0
+    # endregion
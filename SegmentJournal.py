@@ -0,0 +1,76 @@
+import json
+import pathlib
+from typing import Optional
+import FileOperations
+
+
+class SegmentJournal:
+    # region Properties
+    split: Optional[dict]
+    completed: dict
+    # endregion
+
+    # region Initialise
+    def __init__(self, path: pathlib.Path):
+        self.__path = FileOperations.absolute_path(path)
+        self.__file = None
+
+        self.split = None  # Segmentation result
+        self.completed = {}  # Index: Rows of (Start, End, Caption)
+        self.__load()
+    # endregion
+
+    # Load Existing Journal
+    def __load(self):
+        try:
+            with open(self.__path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    # Stop at incomplete record (Interrupted while writing)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+
+                    if record['type'] == 'split':
+                        self.split = record
+                    elif record['type'] == 'segment':
+                        self.completed[record['index']] = record['rows']
+
+        except FileNotFoundError:
+            pass
+
+    # region Write
+    def __write(self, record: dict):
+        if self.__file is None:
+            FileOperations.check_directory(self.__path)
+            self.__file = open(self.__path, 'a', encoding='utf-8')
+
+        self.__file.write(json.dumps(record) + '\n')
+        self.__file.flush()
+
+    # Record Segmentation Result
+    def write_split(self, regions: list, clips: list) -> None:
+        self.split = {'type': 'split', 'regions': regions, 'clips': clips}
+        self.__write(self.split)
+
+    # Record Completed Segment
+    def write_segment(self, index: int, rows: list) -> None:
+        self.completed[index] = rows
+        self.__write({'type': 'segment', 'index': index, 'rows': rows})
+    # endregion
+
+    # region Close
+    # Close Journal (Kept for resume)
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    # Close and Remove Journal (Job completed)
+    def remove(self) -> None:
+        self.close()
+        try:
+            self.__path.unlink()
+        except FileNotFoundError:
+            pass
+    # endregion
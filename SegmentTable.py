@@ -0,0 +1,61 @@
+from typing import Iterator, Tuple
+import numpy as np
+
+
+class SegmentTable:
+    # region Initialise
+    def __init__(self, capacity=1024):
+        self.__starts = np.empty(capacity, dtype=np.int64)
+        self.__ends = np.empty(capacity, dtype=np.int64)
+        self.__captions = np.empty(capacity, dtype=object)
+        self.__count = 0
+    # endregion
+
+    # region Properties
+    # Start Samples
+    @property
+    def starts(self) -> np.ndarray:
+        return self.__starts[:self.__count]
+
+    # End Samples
+    @property
+    def ends(self) -> np.ndarray:
+        return self.__ends[:self.__count]
+
+    # Captions
+    @property
+    def captions(self) -> np.ndarray:
+        return self.__captions[:self.__count]
+
+    def __len__(self):
+        return self.__count
+
+    def __iter__(self) -> Iterator[Tuple[int, int, str]]:
+        return zip(self.starts.tolist(), self.ends.tolist(), self.captions)
+    # endregion
+
+    # region Modify
+    # Append Segment
+    def append(self, start: int, end: int, caption: str) -> None:
+        """ Append segment at end of table, capacity is doubled when full """
+        if self.__count == len(self.__starts):
+            self.__grow(max(1, len(self.__starts) * 2))
+
+        self.__starts[self.__count] = start
+        self.__ends[self.__count] = end
+        self.__captions[self.__count] = caption
+        self.__count += 1
+
+    # Grow Capacity
+    def __grow(self, capacity):
+        self.__starts = np.resize(self.__starts, capacity)
+        self.__ends = np.resize(self.__ends, capacity)
+        captions = np.empty(capacity, dtype=object)
+        captions[:self.__count] = self.__captions[:self.__count]
+        self.__captions = captions
+
+    # Clear Table
+    def clear(self) -> None:
+        self.__captions[:self.__count] = None
+        self.__count = 0
+    # endregion
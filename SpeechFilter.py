@@ -0,0 +1,64 @@
+import numpy as np
+
+# Default Thresholds
+FLATNESS_THRESHOLD = 0.5  # Mean spectral flatness above this is noise like
+ZCR_THRESHOLD = 0.35  # Mean zero crossing rate above this is hiss like
+ENERGY_STD_THRESHOLD = 3.0  # Frame energy deviation (dB) below this is stationary, such as music or hum
+MIN_VARIANCE_FRAMES = 3  # Regions of fewer frames pass energy deviation test (Too short to measure)
+
+
+# Frame Features of Whole Buffer
+def frame_features(audio: np.ndarray, frame_len: int, hop_len: int, chunk_frames=1024):
+    """
+    Compute spectral flatness, zero crossing rate and energy (dB) of each frame in the audio.
+    Features are computed by chunks of frames to limit memory.
+    Return three arrays of frame count length
+    """
+    if len(audio) < frame_len:
+        audio = np.pad(audio, (0, frame_len - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_len)[::hop_len]
+    window = np.hanning(frame_len).astype(np.float32)
+
+    flatness = np.empty(len(frames), dtype=np.float32)
+    zcr = np.empty(len(frames), dtype=np.float32)
+    energy = np.empty(len(frames), dtype=np.float32)
+    for start in range(0, len(frames), chunk_frames):
+        chunk = frames[start:start + chunk_frames]
+        power = np.abs(np.fft.rfft(chunk * window, axis=1)) ** 2 + 1e-10
+        flatness[start:start + chunk_frames] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        zcr[start:start + chunk_frames] = np.mean(np.diff(np.signbit(chunk), axis=1), axis=1)
+        energy[start:start + chunk_frames] = 10 * np.log10(np.mean(chunk ** 2, axis=1) + 1e-10)
+
+    return flatness, zcr, energy
+
+
+# Speech Regions Mask
+def speech_mask(audio: np.ndarray, regions: list, frame_len: int, hop_len: int,
+                flatness_threshold=FLATNESS_THRESHOLD, zcr_threshold=ZCR_THRESHOLD,
+                energy_std_threshold=ENERGY_STD_THRESHOLD) -> np.ndarray:
+    """
+    Classify each region (Start, End in samples) as speech by its mean frame features.
+    Return boolean array, True for speech
+    """
+    if not regions:
+        return np.zeros(0, dtype=bool)
+
+    flatness, zcr, energy = frame_features(audio, frame_len, hop_len)
+
+    # Frame range of each region
+    bounds = np.asarray(regions, dtype=np.int64)
+    first = np.minimum(bounds[:, 0] // hop_len, len(energy) - 1)
+    last = np.clip(-(-bounds[:, 1] // hop_len), first + 1, len(energy))
+    count = last - first
+
+    # Region means by cumulative sums
+    def region_mean(values):
+        cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+        return (cumulative[last] - cumulative[first]) / count
+
+    energy_mean = region_mean(energy)
+    energy_std = np.sqrt(np.maximum(region_mean(energy ** 2) - energy_mean ** 2, 0))
+
+    return ((region_mean(flatness) <= flatness_threshold) &
+            (region_mean(zcr) <= zcr_threshold) &
+            ((energy_std >= energy_std_threshold) | (count < MIN_VARIANCE_FRAMES)))
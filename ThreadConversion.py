@@ -1,10 +1,7 @@
-import math
 import pathlib
-import random
-import time
 import queue
-from threading import Thread
 import FileOperations
+from JobRunner import JobRunner
 from FileImports import FileImport, InvalidAudioException
 from PyQt5.QtCore import QThread, pyqtSignal
 
@@ -22,13 +19,13 @@ class ThreadConversion(QThread):
                  log_path: pathlib.Path = pathlib.Path("logs")):
         self.file_list = file_list.copy()
         self.__queue = queue.Queue()
+        self.__runner = JobRunner()
         self.__file_count = 0
         self.__file_complete = 0
         self.__output_dict = {}
         self.__des_path = FileOperations.get_directory(des_path)
         self.__log_path = FileOperations.absolute_path(log_path)
         self.__cancel = False
-        self.__current_pgr = 1
         QThread.__init__(self)
     # endregion
 
@@ -36,20 +33,6 @@ class ThreadConversion(QThread):
     # Set Progress
     def __progress(self, string, percent):
         self.sgn_progress.emit(str(string), percent)
-        self.__current_pgr = percent
-
-    # Random Progress
-    def __random_progress(self, string):
-        try:
-            a = self.__current_pgr
-            b = round((self.__file_complete + 1) / self.__file_count * 100)
-            b = 99 if b > 99 else b
-            percent = int(math.floor(a + (b - a + 1) * (1.0 - random.random() ** (1.0 / 4.0))))
-
-        except ZeroDivisionError:
-            percent = 100
-
-        self.__progress(string, percent)
 
     # Update Progress
     def __update_progress(self, string, in_between=0.0):
@@ -65,14 +48,12 @@ class ThreadConversion(QThread):
     # Convert Files
     def __convert(self):
         # Declaration
-        in_process = False
         file_source = None
         file_import = None
-        thread_exec = None
 
-        while self.__queue.not_empty or not self.__queue.all_tasks_done:
+        while self.__queue.unfinished_tasks > 0:
             try:
-                if not in_process:
+                if file_import is None:
                     # If Cancel, Quit
                     if self.__cancel:
                         print(f'Conversion thread has been cancelled!')
@@ -80,20 +61,18 @@ class ThreadConversion(QThread):
                         return
 
                     # Get Source from Queue
-                    file_source = self.__queue.get(block=True, timeout=1)
+                    file_source = self.__queue.get(block=False)
 
                     # Perform Conversion
                     file_import = FileImport(file_source, self.__des_path, self.__log_path)
-                    thread_exec = Thread(target=file_import.convert, daemon=True)
-                    thread_exec.start()
-                    in_process = True
+                    file_import.progress_callback = self.__runner.notify_progress
+                    self.__runner.submit(file_source, file_import.convert)
 
-                elif file_import.completed:
-                    # Stop Thread
-                    thread_exec.join(timeout=1)
-                    if thread_exec.is_alive():
-                        continue
-                    in_process = False
+                # Wait for finished conversion (Woken on completion or progress)
+                for _, future in self.__runner.wait():
+                    exception = future.exception()
+                    if exception is not None:
+                        raise exception
 
                     # Set Output
                     self.__output_dict[file_source] = [file_import.output, file_source]
@@ -101,6 +80,7 @@ class ThreadConversion(QThread):
                     # Set Task Done
                     self.__queue.task_done()
                     self.__file_complete += 1
+                    file_import = None
 
                     # Get Progress
                     self.__update_progress(file_source)
@@ -108,22 +88,9 @@ class ThreadConversion(QThread):
                     # Print Output
                     print(f'{file_source} conversion done!')
 
-                elif file_import.exception:
-                    # Stop Thread
-                    thread_exec.join(timeout=1)
-                    raise file_import.exception
-
-                else:
-                    # If Audio Conversion, Random Progress
-                    if file_import.sound_conversion:
-                        self.__random_progress(file_source)
-
-                    # If Video Conversion, Get Progress
-                    else:
-                        self.__update_progress(file_source, file_import.percentage)
-
-                    # Sleep
-                    time.sleep(1)
+                # Progress of running conversion (Video by frames written, audio by stage)
+                if file_import is not None:
+                    self.__update_progress(file_source, file_import.percentage)
 
             # Exception if Audio is Missing
             except InvalidAudioException as exc:
@@ -132,7 +99,7 @@ class ThreadConversion(QThread):
                 # Set Task Done
                 self.__queue.task_done()
                 self.__file_complete += 1
-                in_process = False
+                file_import = None
 
                 # Get Progress
                 self.__update_progress(file_source)
@@ -144,6 +111,8 @@ class ThreadConversion(QThread):
             except queue.Empty:
                 break
 
+        self.__runner.shutdown()
+
         print(f'Conversion thread has completed!')
         self.__progress("Completed!", 100)
 
@@ -165,6 +134,7 @@ class ThreadConversion(QThread):
     # Cancel
     def cancel(self):
         self.__cancel = True
+        self.__runner.interrupt()
 
 
 class ThreadConversion_Cancel(QThread):
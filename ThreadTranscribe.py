@@ -1,9 +1,13 @@
+import os
 import pathlib
-import time
-import queue
+from typing import Optional
+import torch
 import FileOperations
-from threading import Thread
-from Transcribe import Transcribe
+from JobRunner import JobRunner
+from Transcribe import Transcribe, probe_duration
+from Transcriber import Transcriber, loaded_models, unload
+from DegradationPolicy import DegradationPolicy
+from JobScheduler import JobScheduler
 from PyQt5.QtCore import QThread, pyqtSignal
 
 
@@ -18,7 +22,9 @@ class ThreadTranscribe(QThread):
     # region Initialise
     def __init__(self, files: dict, output_path: pathlib.Path = None,
                  temp_path: pathlib.Path = pathlib.Path("audio\\temp"), log_path: pathlib.Path = pathlib.Path("logs"),
-                 split=True, model="English"):
+                 split=True, model="English", cache_path: pathlib.Path = pathlib.Path("cache\\transcription"),
+                 device: Optional[str] = None, profile="balanced", time_budget: Optional[float] = None,
+                 schedule="sjf", priorities: Optional[dict] = None, file_workers=1):
         self.__files = files.copy()
         if output_path is None:
             self.__output_path = None
@@ -26,10 +32,24 @@ class ThreadTranscribe(QThread):
             self.__output_path = FileOperations.absolute_path(output_path)
         self.__temp_path = FileOperations.absolute_path(temp_path)
         self.__log_path = FileOperations.absolute_path(log_path)
+        self.__cache_path = None if cache_path is None else FileOperations.absolute_path(cache_path)
         self.__split = split
         self.__model = model
+        self.__device = device
+        self.__profile = profile
 
-        self.__queue = queue.Queue()
+        # Degrade decoding profile of queued jobs if projected to exceed time budget (Seconds, None to disable)
+        self.__policy = None if time_budget is None else DegradationPolicy(time_budget, profile.lower())
+        self.__durations = {}  # Audio duration of queued files (None if unknown)
+
+        # Job order (As in JobScheduler.POLICIES), priorities keyed as files (Higher first)
+        self.__queue = JobScheduler(schedule)
+        self.__priorities = priorities or {}
+
+        # Files transcribed concurrently (Each job loads own model, so model memory, GPU included, scales with count)
+        self.__file_workers = max(1, file_workers)
+        self.__jobs = []  # Running jobs (Source, File Location, Recognizer, Profile, Model Slot)
+        self.__runner = JobRunner(self.__file_workers)
         self.__completed_file = []
         self.__output_file = []
 
@@ -58,107 +78,147 @@ class ThreadTranscribe(QThread):
         except ZeroDivisionError:
             percent = 100
         self.__progress(string, percent)
+
+    # Progress of Running Jobs (Sum of file progress)
+    def __jobs_progress(self):
+        return sum(recognizer.progress for _, _, recognizer, _, _ in self.__jobs)
+    # endregion
+
+    # region Degradation Policy
+    # Remaining Audio Duration (Unknown durations estimated by mean of known, running jobs by part not done)
+    def __remaining_duration(self):
+        known = [duration for duration in self.__durations.values() if duration is not None]
+        mean = sum(known) / len(known) if known else 0
+        remaining = sum(mean if duration is None else duration for duration in self.__durations.values())
+        for _, file_loc, recognizer, _, _ in self.__jobs:
+            duration = self.__durations.get(file_loc)
+            remaining -= recognizer.progress * (mean if duration is None else duration)
+        return remaining
+
+    # Get Decoding Profile of Next Job
+    def __job_profile(self):
+        if self.__policy is None:
+            return self.__profile
+
+        # Files left are shared by workers
+        remaining = self.__remaining_duration()
+        workers = max(1, min(self.__file_workers, len(self.__durations)))
+        switched = self.__policy.select(remaining, workers)
+        if switched is not None:
+            projection = self.__policy.projection(remaining, workers)
+            message = "Profile switched to {0}: {1} files, {2:.0f} s audio queued, projected {3} s, budget {4:.0f} s" \
+                .format(switched, len(self.__durations), remaining,
+                        "unknown" if projection is None else "{:.0f}".format(projection), self.__policy.budget)
+            print(message)
+            FileOperations.output_log("Transcription Policy", [message], self.__log_path)
+        return self.__policy.current
+
+    # Record Finished Job
+    def __job_finished(self, file_loc, profile, recognizer: Optional[Transcribe]):
+        self.__durations.pop(file_loc, None)
+        if self.__policy is not None and recognizer is not None:
+            self.__policy.record(profile, recognizer.real_time_factor)
+    # endregion
+
+    # region Jobs
+    # Start Next Job from Queue
+    def __start_job(self):
+        # Get from Queue
+        source, file_loc, caption_path = self.__queue.get(block=False)
+
+        # Get Output Path, Output beside original media if no path stated
+        if self.__output_path is not None and str(self.__output_path) != '.':
+            caption_path = self.__output_path
+        caption_path = FileOperations.get_directory(caption_path)
+
+        # Call for Speech Recognition (Each running job decodes with own model, first free slot)
+        used_slots = [job[4] for job in self.__jobs]
+        slot = next(slot for slot in range(len(used_slots) + 1) if slot not in used_slots)
+        job_profile = self.__job_profile()
+        recognizer = Transcribe(file_loc, caption_path, self.__temp_path,
+                                self.__log_path, self.__model, cache_path=self.__cache_path,
+                                device=self.__device, profile=job_profile, model_slot=slot)
+        recognizer.progress_callback = self.__runner.notify_progress
+        job = (source, file_loc, recognizer, job_profile, slot)
+        self.__jobs.append(job)
+        if self.__split:
+            self.__runner.submit(job, recognizer.speech_recognition_split)
+        else:
+            self.__runner.submit(job, recognizer.speech_recognition_full)
+
+    # Complete Job
+    def __complete_job(self, job):
+        source, file_loc, recognizer, job_profile, _ = job
+        self.__jobs.remove(job)
+
+        # Set Task Done
+        # If source is directory, it is recording, append its file loc instead
+        if source.is_dir():
+            self.__completed_file.append(file_loc)
+        else:
+            self.__completed_file.append(source)
+        self.__output_file.append(recognizer.caption_output)
+        self.__queue.task_done()
+        self.__file_complete += 1
+        self.__job_finished(file_loc, job_profile, recognizer)
+
+        # Print Output
+        print(f'{source} transcription done!')
+
+    # Skip Job (File Not Found)
+    def __skip_job(self, job, exc: FileNotFoundError):
+        source, file_loc, _, job_profile, _ = job
+        self.__jobs.remove(job)
+        self.sgn_error.emit(f"File not found!\n{exc.filename}", "File Not Found")
+
+        # Set Task Done
+        self.__queue.task_done()
+        self.__file_complete += 1
+        self.__job_finished(file_loc, job_profile, None)
+
+        # Print Output
+        print(f'{source} transcription skipped!')
+
+    # Cancel Running Jobs and Wait
+    def __cancel_jobs(self):
+        for _, _, recognizer, _, _ in self.__jobs:
+            recognizer.cancel_transcribe()
+        self.__runner.shutdown(wait=True)
+        self.__jobs.clear()
     # endregion
 
     # Transcription Process
     def __start_transcribe(self):
-        # Declaration
-        source = None
-        file_loc = None
-        in_process = False
-        recognizer = None
-        thread_exec = None
-
         # Loop for all files
         while self.__queue.unfinished_tasks > 0:
-            try:
-                # If cancel, Signal and Stop
-                if self.__cancel:
-                    if in_process:
-                        recognizer.cancel_transcribe()
-                        time.sleep(1)
-                    else:
-                        print(f'Transcription thread has been cancelled!')
-                        self.__progress("Cancelled!", 100)
-                        return
-
-                # If not in process, Start transcribe
-                if not in_process:
-
-                    # Get from Queue
-                    source, file_loc, caption_path = self.__queue.get(block=True, timeout=1)
-
-                    # Get Output Path, Output beside original media if no path stated
-                    if self.__output_path is not None and str(self.__output_path) != '.':
-                        caption_path = self.__output_path
-                    caption_path = FileOperations.get_directory(caption_path)
-
-                    # Call for Speech Recognition
-                    recognizer = Transcribe(file_loc, caption_path, self.__temp_path,
-                                            self.__log_path, self.__model)
-                    if self.__split:
-                        thread_exec = Thread(target=recognizer.speech_recognition_split, daemon=True)
-                    else:
-                        thread_exec = Thread(target=recognizer.speech_recognition_full, daemon=True)
-                    thread_exec.start()
-                    in_process = True
-
-                elif recognizer.completed:
-                    # Stop Thread
-                    thread_exec.join(timeout=1)
-                    if thread_exec.is_alive():
-                        continue
-                    in_process = False
-
-                    if self.__cancel and recognizer.cancel:
-                        print(f'Transcription thread has been cancelled!')
-                        self.__progress("Cancelled!", 100)
-                        return
-
-                    # Set Task Done
-                    # If source is directory, it is recording, append its file loc instead
-                    if source.is_dir():
-                        self.__completed_file.append(file_loc)
-                    else:
-                        self.__completed_file.append(source)
-                    self.__output_file.append(recognizer.caption_output)
-                    self.__queue.task_done()
-                    self.__file_complete += 1
-
-                    # Update Progress
-                    self.__update_progress(source)
-
-                    # Print Output
-                    print(f'{source} transcription done!')
-
-                elif recognizer.exception:
-                    # Stop Thread
-                    thread_exec.join(timeout=1)
-                    raise recognizer.exception
-
+            # If cancel, Signal and Stop
+            if self.__cancel:
+                self.__cancel_jobs()
+                print(f'Transcription thread has been cancelled!')
+                self.__progress("Cancelled!", 100)
+                return
+
+            # Start jobs up to worker count (Stop starting once cancelled)
+            while not self.__cancel and len(self.__jobs) < self.__file_workers and len(self.__queue) > 0:
+                self.__start_job()
+
+            # Wait for finished jobs (Woken on completion, progress or cancel)
+            for job, future in self.__runner.wait():
+                source, _, recognizer, _, _ = job
+                exception = future.exception() or recognizer.exception
+                if exception is None:
+                    self.__complete_job(job)
+                elif isinstance(exception, FileNotFoundError):
+                    self.__skip_job(job, exception)
                 else:
-                    # Update Progress
-                    self.__update_progress(source, recognizer.progress)
-                    time.sleep(1)
-
-            # File Not Found Exception
-            except FileNotFoundError as exc:
-                self.sgn_error.emit(f"File not found!\n{exc.filename}", "File Not Found")
-
-                # Set Task Done
-                self.__queue.task_done()
-                self.__file_complete += 1
-                in_process = False
-
-                # Get Progress
-                self.__update_progress(source)
+                    raise exception
+                self.__update_progress(source, self.__jobs_progress())
 
-                # Print Output
-                print(f'{source} transcription skipped!')
+            # Update Progress (Oldest running file)
+            if self.__jobs:
+                self.__update_progress(self.__jobs[0][0], self.__jobs_progress())
 
-            # Stop if Queue is Empty
-            except queue.Empty:
-                break
+        self.__runner.shutdown()
 
         # Finished
         print(f'Transcription thread has completed!')
@@ -167,24 +227,48 @@ class ThreadTranscribe(QThread):
     # Enqueue
     def __enqueue(self, files: dict):
         for key, value in files.items():
+            file_loc = FileOperations.absolute_path(value[0])
+            duration = probe_duration(file_loc)
+            if self.__policy is not None:
+                self.__durations[file_loc] = duration
             self.__queue.put((FileOperations.absolute_path(key),
-                              FileOperations.absolute_path(value[0]),
-                              FileOperations.absolute_path(value[1])))
+                              file_loc,
+                              FileOperations.absolute_path(value[1])),
+                             duration, self.__priorities.get(key, 0))
             self.__file_count += 1
-        time.sleep(0)  # Await queue
 
     # Run
     def run(self):
         self.__progress("Starting...", 1)
         self.sgn_lock.emit(True)
         self.__enqueue(self.__files)
-        self.__start_transcribe()
+
+        # Release models of other model choice (Such as of previous run)
+        device = (self.__device or Transcriber.default_device()).lower()
+        for model, model_device, slot in loaded_models():
+            if (model, model_device) != (self.__model, device):
+                unload(model, model_device, slot)
+
+        # Divide cores between concurrent jobs (Torch threads are shared by process)
+        threads = torch.get_num_threads()
+        if self.__file_workers > 1:
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // self.__file_workers))
+
+        try:
+            self.__start_transcribe()
+        finally:
+            torch.set_num_threads(threads)
+
+            # Release models of concurrent jobs (First slot kept for next run)
+            for slot in range(1, self.__file_workers):
+                unload(self.__model, slot=slot)
         self.sgn_lock.emit(False)
         self.sgn_finished.emit(self.__completed_file, self.__output_file)
 
     # Cancel
     def cancel(self):
         self.__cancel = True
+        self.__runner.interrupt()
 
 
 class ThreadTranscribe_Cancel(QThread):
@@ -1,11 +1,10 @@
 import pathlib
-import time
 import queue
 
 import httpcore
 
 import FileOperations
-from threading import Thread
+from JobRunner import JobRunner
 from Translate import Translate
 from PyQt5.QtCore import QThread, pyqtSignal
 
@@ -33,6 +32,7 @@ class ThreadTranslate(QThread):
         self.__model_name = model_name
 
         self.__queue = queue.Queue()
+        self.__runner = JobRunner()
         self.__completed_file = []
         self.__output_file = []
 
@@ -67,28 +67,25 @@ class ThreadTranslate(QThread):
     def __start_translate(self):
         # Declaration
         source = None
-        in_process = False
-        thread_exec = None
         translator = None
 
         # Loop for all files
         while self.__queue.unfinished_tasks > 0:
             try:
-                # If cancel, Signal and Stop
+                # If cancel, Signal and Stop (After running translation stops)
                 if self.__cancel:
-                    if in_process:
+                    if translator is not None:
                         translator.cancel_translate()
-                        time.sleep(1)
-                    else:
-                        print(f'Translation thread has been cancelled!')
-                        self.__progress("Cancelled!", 100)
-                        return
+                    self.__runner.shutdown(wait=True)
+                    print(f'Translation thread has been cancelled!')
+                    self.__progress("Cancelled!", 100)
+                    return
 
                 # If not in process, Start translate
-                if not in_process:
+                if translator is None:
 
                     # Get from Queue
-                    source = self.__queue.get(block=True, timeout=1)
+                    source = self.__queue.get(block=False)
 
                     # Get Output Path, Output beside original file if no path stated
                     if str(self.__output_path) == '.' or self.__output_path is None:
@@ -101,27 +98,21 @@ class ThreadTranslate(QThread):
                     translator = Translate(source, output_path, self.__log_path,
                                            self.__src_language, self.__des_language,
                                            self.__model_translator, self.__model_name)
-                    thread_exec = Thread(target=translator.translate, daemon=True)
-                    thread_exec.start()
-                    in_process = True
-
-                elif translator.completed:
-                    # Stop Thread
-                    thread_exec.join(timeout=1)
-                    if thread_exec.is_alive():
-                        continue
-                    in_process = False
-
-                    if self.__cancel and translator.cancel:
-                        print(f'Translation thread has been cancelled!')
-                        self.__progress("Cancelled!", 100)
-                        return
+                    translator.progress_callback = self.__runner.notify_progress
+                    self.__runner.submit(source, translator.translate)
+
+                # Wait for finished translation (Woken on completion, progress or cancel)
+                for _, future in self.__runner.wait():
+                    exception = future.exception()
+                    if exception is not None:
+                        raise exception
 
                     # Set Task Done
                     self.__completed_file.append(source)
                     self.__output_file.append(translator.output)
                     self.__queue.task_done()
                     self.__file_complete += 1
+                    translator = None
 
                     # Update Progress
                     self.__update_progress(source)
@@ -129,27 +120,21 @@ class ThreadTranslate(QThread):
                     # Print Output
                     print(f'{source} translation done!')
 
-                elif translator.exception:
-                    # Stop Thread
-                    thread_exec.join(timeout=1)
-                    raise translator.exception
-
-                else:
-                    # Random Progress
+                # Progress of running translation
+                if translator is not None:
                     self.__update_progress(source, translator.percentage)
-                    time.sleep(1)
 
             except (httpcore.ReadTimeout, httpcore.ConnectTimeout):
-                self.sgn_error.emit("Unable to Connect to Google Translate\n"
-                                    "Please try again later!\n"
-                                    "(May be due to IP Blocked by Google for Bulk Translation)", "Connection Error")
+                self.sgn_err.emit("Unable to Connect to Google Translate\n"
+                                  "Please try again later!\n"
+                                  "(May be due to IP Blocked by Google for Bulk Translation)", "Connection Error")
 
                 # Set Task Done
                 self.__completed_file.append(source)
                 self.__output_file.append(translator.output)
                 self.__queue.task_done()
                 self.__file_complete += 1
-                in_process = False
+                translator = None
                 self.__cancel = True
 
                 # Update Progress
@@ -162,6 +147,8 @@ class ThreadTranslate(QThread):
             except queue.Empty:
                 break
 
+        self.__runner.shutdown()
+
         # Finished
         print(f'Translation thread has completed!')
         self.__progress("Completed!", 100)
@@ -184,6 +171,7 @@ class ThreadTranslate(QThread):
     # Cancel
     def cancel(self):
         self.__cancel = True
+        self.__runner.interrupt()
 
 
 class ThreadTranslate_Cancel(QThread):
@@ -0,0 +1,57 @@
+from typing import List, Optional
+
+
+class TokenBatcher:
+    # region Properties
+    token_budget: int
+    max_batch: int
+    real_tokens: int
+    padded_tokens: int
+    # endregion
+
+    # region Initialise
+    def __init__(self, token_budget=2048, max_batch=64):
+        """
+        Group sentences of similar token length into batches, padded size of each batch
+        (Longest length times count) within token budget
+        """
+        self.token_budget = token_budget
+        self.max_batch = max_batch
+
+        # Padding Statistics
+        self.real_tokens = 0
+        self.padded_tokens = 0
+    # endregion
+
+    # Padding Waste (Part of padded tokens that are padding)
+    @property
+    def padding_waste(self) -> float:
+        if self.padded_tokens == 0:
+            return 0.0
+        return 1 - self.real_tokens / self.padded_tokens
+
+    # Form Batches
+    def batches(self, lengths: List[int], padded_length: Optional[int] = None) -> List[List[int]]:
+        """
+        Return batches of indices into lengths, shortest first. Results are restored to original order by index.
+        Padded length is given if model pads every sentence to fixed length
+        """
+        batches = []
+        batch = []
+        for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # Sorted by length, so sentence is longest of batch
+            longest = padded_length or max(1, lengths[index])
+            if batch and (longest * (len(batch) + 1) > self.token_budget or len(batch) >= self.max_batch):
+                batches.append(batch)
+                batch = []
+            batch.append(index)
+        if batch:
+            batches.append(batch)
+
+        # Record Padding
+        for batch in batches:
+            longest = padded_length or max(1, max(lengths[index] for index in batch))
+            self.real_tokens += sum(min(lengths[index], longest) for index in batch)
+            self.padded_tokens += longest * len(batch)
+
+        return batches
@@ -1,32 +1,110 @@
+import errno
+import hashlib
+import json
+import os
 import pathlib
-from typing import Optional, Union
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from typing import Callable, Optional, Union
 import numpy as np
 import soundfile as sf
-from Transcriber import Transcriber
+from Transcriber import Transcriber, get_transcriber
 import librosa
 import torch
 import math
 import time
 import FileOperations
+from CaptionWriter import CaptionWriter
+from ResultCache import ResultCache
+from SegmentJournal import SegmentJournal
+from SegmentTable import SegmentTable
+import SpeechFilter
 
-MODELS = Transcriber.model_choice.keys()
+PROFILES = Transcriber.profile_choice.keys()
+# Model choices with decoding profile, as listed for selection
+MODEL_CHOICES = {"{0} ({1})".format(model, profile.capitalize()): (model, profile)
+                 for model in Transcriber.model_choice.keys() for profile in PROFILES}
+MODELS = MODEL_CHOICES.keys()
+
+
+# Probe Audio Duration from File Header (Seconds, None if not readable without decoding)
+def probe_duration(file: pathlib.Path) -> Optional[float]:
+    try:
+        return sf.info(str(file)).duration
+    except RuntimeError:  # Unsupported format or missing file
+        return None
+
+
+# region Cascade
+def _cascade_transcribe(fast: Transcriber, full: Transcriber, audio: np.ndarray,
+                        logprob_threshold: float, no_speech_threshold: float, **options):
+    """
+    Transcribe with fast model, re-decode with full model if any speech segment is below log probability threshold.
+    Segments above no speech threshold are not speech, so not re-decoded. Return result and whether re-decoded
+    """
+    transcribed = fast.transcribe(audio, True, **options)
+    for segment in transcribed['segments']:
+        if segment['no_speech_prob'] <= no_speech_threshold and segment['avg_logprob'] < logprob_threshold:
+            return full.transcribe(audio, True, **options), True
+    return transcribed, False
+# endregion
+
+
+# region Parallel Worker
+# Transcriber loaded once per worker process
+_worker_transcriber: Optional[Transcriber] = None
+_worker_cascade: Optional[tuple] = None  # (Fast Transcriber, Log Probability Threshold, No Speech Threshold)
+
+
+def _init_worker(model, device, threads, cascade: Optional[tuple] = None):
+    global _worker_transcriber, _worker_cascade
+    torch.set_num_threads(threads)
+    _worker_transcriber = get_transcriber(model, device)
+    if cascade is not None:
+        cascade_model, cascade_device, logprob_threshold, no_speech_threshold = cascade
+        _worker_cascade = (get_transcriber(cascade_model, cascade_device), logprob_threshold, no_speech_threshold)
+
+
+def _worker_transcribe(audio: np.ndarray, options: dict):
+    if _worker_cascade is None:
+        return _worker_transcriber.transcribe(audio, True, **options), False
+    fast, logprob_threshold, no_speech_threshold = _worker_cascade
+    return _cascade_transcribe(fast, _worker_transcriber, audio, logprob_threshold, no_speech_threshold, **options)
+
+
+def _worker_detect_language(audio: np.ndarray) -> str:
+    return _worker_transcriber.detect_language(audio)
+# endregion
 
 
 class Transcribe:
     # region Properties
     print_msg: bool
+    write_clips: bool
+    stream: bool
+    pack: bool
+    workers: int
+    worker_threads: int
+    speech_filter: bool
+    real_time_factor: Optional[float]
     progress: float
     completed: bool
     exception: Optional[Exception]
     text_output: Optional[pathlib.Path]
     caption_output: Optional[pathlib.Path]
     cancel: bool
+    progress_callback: Optional[Callable[[], None]]
     # endregion
 
     # region INIT
     def __init__(self, audio_filename: pathlib.Path, destination_path: pathlib.Path = None,
                  temp_path: pathlib.Path = pathlib.Path("audio\\temp"), log_path: pathlib.Path = pathlib.Path("logs"),
-                 model="English", print_msg=False, background_db=40):
+                 model="English", print_msg=False, background_db=40, write_clips=False, stream=False,
+                 block_frames=1024, pack=False, window_seconds=30, workers=1, worker_threads=0,
+                 cache_path: Optional[pathlib.Path] = pathlib.Path("cache\\transcription"),
+                 cache_size=1024*1024*1024, device: Optional[str] = None, cascade=False,
+                 cascade_model: Optional[str] = None, cascade_device="cpu_int8", logprob_threshold=-1.0,
+                 no_speech_threshold=0.6, speech_filter=False, filter_thresholds: Optional[dict] = None,
+                 language: Optional[str] = None, detect_seconds=30, profile="balanced", model_slot=0):
         # Files
         self.__source = FileOperations.absolute_path(audio_filename)
         self.__filepath, self.__filename, self.__filetype = FileOperations.filename_separator(self.__source)
@@ -40,21 +118,64 @@ class Transcribe:
         self.__temp_path = FileOperations.absolute_path(temp_path)
         self.__log_path = FileOperations.absolute_path(log_path)
 
-        # Other Properties
-        if torch.cuda.is_available():
-            device = "gpu"
+        # Result Cache (Disabled if no path given), cache size is shared by job results and segment results
+        if cache_path is None:
+            self.__cache = None
+            self.__segment_cache = None
+        else:
+            cache_path = FileOperations.absolute_path(cache_path)
+            self.__cache = ResultCache(cache_path, cache_size // 4)
+            self.__segment_cache = ResultCache(pathlib.Path(cache_path) / "segments", cache_size - cache_size // 4)
+        self.__cache_hit = False
+        self.__reused_count = 0
+        self.__decoded_count = 0
+
+        # Other Properties (Select device if not given)
+        if device is None:
+            device = Transcriber.default_device()
+        self.__model_name = model
+        self.__device = device
+        self.__profile = profile.lower()  # Decoding profile, as in Transcriber.profile_choice
+        self.__transcriber = None  # Loaded on first use, not loaded here if only worker processes transcribe
+        self.__fast_transcriber = None
+        self.__model_slot = model_slot  # Registry slot, concurrent jobs in one process use different slots
+
+        # Cascade, Fast model first, re-decode low confidence segments with model above
+        # Model tag keys cached results by model, device (Quantized results differ) and decoding options
+        if cascade:
+            self.__cascade = (cascade_model or model, cascade_device, logprob_threshold, no_speech_threshold)
+            self.__model_tag = "{0}|{1}|{2}|Cascade|{3}".format(model, device.lower(), self.__profile,
+                                                                "|".join(str(option) for option in self.__cascade))
         else:
-            device = "cpu"
-        self.__transcriber = Transcriber(model, device)
+            self.__cascade = None
+            self.__model_tag = "{0}|{1}|{2}".format(model, device.lower(), self.__profile)
+        self.__redecoded_count = 0
+
+        # Language, Detected once on first seconds of speech if not given
+        self.__language = language
+        self.__language_given = language is not None
+        self.__detect_len = detect_seconds * Transcriber.sample_rate
+
+        # Speech Filter, Drop non-speech regions before recognition (Thresholds as in SpeechFilter.speech_mask)
+        self.__filter_thresholds = filter_thresholds or {}
+        self.__filtered_count = None
         self.__source_audio = None
         self.__sample_rate = None
-        self.__captions = []
-        self.__timestamps = []
-        self.__loaded_timestamps = []
-
-        self.__hop_len = 3072
-        self.__frame_len = 2048
+        self.__total_frames = 0
+        self.__clips = []
+        self.__regions = []  # Speech regions (Start, End) from splitting
+        self.__segments = SegmentTable()  # Recognised segments (Start, End, Caption)
+        self.__writer = None  # Writes segments to output as recognised
+        self.__journal = None  # Records completed segments for resume
+        self.__resumed_count = 0
+
+        # Frame and hop length at model sample rate (Same duration as 2048 and 3072 samples at 22050 Hz)
+        self.__hop_len = round(3072 * Transcriber.sample_rate / 22050)
+        self.__frame_len = round(2048 * Transcriber.sample_rate / 22050)
         self.__bg_db = background_db
+        self.__block_frames = block_frames  # Number of hops read per block in streaming mode
+        self.__window_len = window_seconds * Transcriber.sample_rate  # Packed window length in samples
+        self.__windows = []
 
         self.__segment_count = 0
         self.__last_time_used = 0
@@ -63,55 +184,81 @@ class Transcribe:
 
         # Public Properties
         self.print_msg = print_msg
+        self.write_clips = write_clips
+        self.stream = stream
+        self.pack = pack
+        self.workers = workers
+        self.worker_threads = worker_threads  # Torch threads per worker (0 to divide cores by workers)
+        self.speech_filter = speech_filter
+        self.real_time_factor = None  # Time used over audio duration of last recognition
         self.progress = 0
         self.completed = False
         self.exception = None
         self.text_output = None
         self.caption_output = None
+        self.cancel = False
+        self.progress_callback = None  # Called in job thread when progress changes
     # endregion
 
     # Timecode Converter
     @staticmethod
     def timecode_converter(seconds):
-        # Milliseconds
-        milliseconds = math.floor(seconds % 1 * 1000)
-        seconds = math.floor(seconds)
+        return CaptionWriter.timecode_converter(seconds)
 
-        # Minutes
-        minutes = math.floor(seconds / 60)
-        seconds %= 60
+    # Get Transcriber (Loaded on first use)
+    def __get_transcriber(self) -> Transcriber:
+        if self.__transcriber is None:
+            self.__transcriber = get_transcriber(self.__model_name, self.__device, self.__model_slot)
+        return self.__transcriber
 
-        # Hours
-        hours = math.floor(minutes / 60)
-        minutes %= 60
-
-        return hours, minutes, seconds, milliseconds
+    # Get Fast Transcriber of Cascade (Loaded on first use)
+    def __get_fast_transcriber(self) -> Transcriber:
+        if self.__fast_transcriber is None:
+            self.__fast_transcriber = get_transcriber(*self.__cascade[:2], self.__model_slot)
+        return self.__fast_transcriber
 
     # Cancel
     def cancel_transcribe(self):
         self.cancel = True
 
+    # Set Progress (Notify callback if changed)
+    def __set_progress(self, progress):
+        if progress != self.progress:
+            self.progress = progress
+            if self.progress_callback is not None:
+                self.progress_callback()
+
     # region Split Recognition
+    # Load Audio File (Decode once to mono float32 at model sample rate)
+    def __load_audio(self):
+        self.__source_audio, self.__sample_rate = librosa.load(self.__source, sr=Transcriber.sample_rate,
+                                                               mono=True, dtype=np.float32)
+
     # Split Audio File
     def __split_audio(self):
-        # Create directory if not exists
-        FileOperations.check_directory(self.__temp_path)
+        # Clips are only written to temp directory for debugging
+        if self.write_clips:
+            # Create directory if not exists
+            FileOperations.check_directory(self.__temp_path)
 
-        # Remove Files if exists
-        FileOperations.remove_files(self.__temp_path, "{}*".format(self.__filename))
-        FileOperations.remove_old_files(self.__temp_path)  # And remove old files
+            # Remove Files if exists
+            FileOperations.remove_files(self.__temp_path, "{}*.wav".format(self.__filename))
+            FileOperations.remove_old_files(self.__temp_path)  # And remove old files
 
         try:
             # Split File
             print("Splitting File...")
-            self.__source_audio, self.__sample_rate = librosa.load(self.__source)
+            if self.__source_audio is None:
+                self.__load_audio()
 
             clips = librosa.effects.split(self.__source_audio, top_db=self.__bg_db,
                                           frame_length=self.__frame_len, hop_length=self.__hop_len)
 
             index = 1
+            self.__clips = []
+            self.__regions = []
 
-            # Loop to Write Clips
+            # Loop to Record Clips
             for c in clips:
                 # Calculate Start Time (Leave some blank audio)
                 if c[0] - self.__hop_len >= 0:
@@ -125,18 +272,19 @@ class Transcribe:
                 else:
                     end = len(self.__source_audio)
 
-                # Write Audio Clips
-                clip_file = FileOperations.filename_combiner(self.__temp_path, self.__filename, 'wav', suffix=index)
-                sf.write(clip_file, self.__source_audio[start:end], self.__sample_rate)
-                if self.print_msg:
-                    print("File Written: {0}".format(clip_file))
+                # Record Clip Boundaries (Sliced from source audio on recognition)
+                self.__clips.append((int(start), int(end)))
 
-                # Calculate Timestamps
-                timecode_start = c[0]
-                timecode_end = c[1]
+                # Write Audio Clips (Debug only)
+                if self.write_clips:
+                    clip_file = FileOperations.filename_combiner(self.__temp_path, self.__filename, 'wav',
+                                                                 suffix=index)
+                    sf.write(clip_file, self.__source_audio[start:end], self.__sample_rate)
+                    if self.print_msg:
+                        print("File Written: {0}".format(clip_file))
 
-                # Record Timestamps
-                self.__timestamps.append({'start': timecode_start, 'end': timecode_end})
+                # Record Speech Region
+                self.__regions.append((int(c[0]), int(c[1])))
                 index += 1
 
             # Write Segment Count
@@ -146,38 +294,185 @@ class Transcribe:
             self.exception = exc
             raise exc
 
-    # File Recognition
-    def __file_recognition(self, audio: Union[pathlib.Path, np.ndarray], index, auto_split=True):
-        # Transcribe
-        transcribed = self.__transcriber.transcribe(str(audio), auto_split)
+    # Filter Non-Speech Regions (Vectorized features over whole buffer)
+    def __filter_regions(self):
+        mask = SpeechFilter.speech_mask(self.__source_audio, self.__regions, self.__frame_len, self.__hop_len,
+                                        **self.__filter_thresholds)
+        self.__regions = [region for region, speech in zip(self.__regions, mask) if speech]
+        self.__clips = [clip for clip, speech in zip(self.__clips, mask) if speech]
 
-        # If more than one sentence, split
-        if auto_split and len(transcribed['segments']) > 1:
-            transcribed_list = []
+        self.__filtered_count = len(mask) - len(self.__regions)
+        self.__segment_count = len(self.__regions)
+        print("Non-Speech Regions Dropped: {0}/{1}".format(self.__filtered_count, len(mask)))
 
-            if index > -1:
-                # If split first time, backup timestamp
-                if not self.__loaded_timestamps:
-                    self.__loaded_timestamps = self.__timestamps.copy()
+    # Streaming Split Audio File (Yield speech regions block by block, in source sample rate)
+    def __stream_split_audio(self):
+        try:
+            print("Splitting File (Streaming)...")
+            if not self.__source.is_file():
+                raise FileNotFoundError(errno.ENOENT, "File Not Found", str(self.__source))
+
+            with sf.SoundFile(str(self.__source)) as file:
+                self.__sample_rate = file.samplerate
+                self.__total_frames = file.frames
+
+                # Frame and hop length at source sample rate
+                hop_len = max(1, round(self.__hop_len * self.__sample_rate / Transcriber.sample_rate))
+                frame_len = max(hop_len, round(self.__frame_len * self.__sample_rate / Transcriber.sample_rate))
+                overlap = frame_len - hop_len
+
+                # Reference level is the loudest frame so far (Whole file peak is unknown while streaming)
+                peak = 1e-10
+                region_start = None
+                region_end = 0
+                position = 0
+
+                for block in file.blocks(blocksize=hop_len * self.__block_frames + overlap, overlap=overlap,
+                                         dtype='float32', always_2d=True):
+                    # Mix down to mono
+                    mono = block.mean(axis=1)
+
+                    # Frame the block, pad last block to full frames
+                    frame_count = math.ceil(max(0, len(mono) - overlap) / hop_len)
+                    if frame_count == 0:
+                        continue
+                    padded_len = (frame_count - 1) * hop_len + frame_len
+                    if len(mono) < padded_len:
+                        mono = np.pad(mono, (0, padded_len - len(mono)))
+                    frames = np.lib.stride_tricks.sliding_window_view(mono, frame_len)[::hop_len][:frame_count]
+
+                    # Frame RMS in dB relative to peak
+                    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+                    peak = max(peak, float(rms.max()))
+                    non_silent = 20 * np.log10(np.maximum(rms, 1e-10) / peak) > -self.__bg_db
+
+                    # Yield regions as they close
+                    for offset, speech in enumerate(non_silent):
+                        frame_start = position + offset * hop_len
+                        if speech:
+                            if region_start is None:
+                                region_start = frame_start
+                            region_end = min(frame_start + frame_len, self.__total_frames)
+                        elif region_start is not None:
+                            yield region_start, region_end
+                            region_start = None
+
+                    position += frame_count * hop_len
+
+                # Yield last region
+                if region_start is not None:
+                    yield region_start, region_end
 
-                # Get timecode for transcribing audio clip
-                first_index = index + len(self.__timestamps) - len(self.__loaded_timestamps)
-                first_start = self.__loaded_timestamps[index]['start']
-                last_end = self.__loaded_timestamps[index]['end']
+        except FileNotFoundError as exc:
+            self.exception = exc
+            raise exc
 
-                # Pop out original timecode
-                self.__timestamps.pop(first_index)
+    # Read Audio Clip from Source (Streaming mode, resampled to model sample rate)
+    def __read_clip(self, start, end):
+        # Leave some blank audio
+        pad = round(self.__hop_len * self.__sample_rate / Transcriber.sample_rate)
+        start = max(0, start - pad)
+        end = min(self.__total_frames, end + pad)
+
+        clip, _ = sf.read(str(self.__source), start=start, stop=end, dtype='float32', always_2d=True)
+        clip = clip.mean(axis=1)
+        if self.__sample_rate != Transcriber.sample_rate:
+            clip = librosa.resample(clip, orig_sr=self.__sample_rate, target_sr=Transcriber.sample_rate)
+        return clip
+
+    # Pack Speech Regions into Model Windows (Silence between regions trimmed to a short gap)
+    def __pack_clips(self):
+        self.__windows = []
+        window = []
+        window_len = 0
+
+        for start, end in self.__regions:
+            region_len = end - start
+            added_len = region_len if not window else region_len + self.__hop_len
+
+            # Start new window if region does not fit
+            if window and window_len + added_len > self.__window_len:
+                self.__windows.append(window)
+                window = []
+                window_len = 0
+                added_len = region_len
+
+            window.append((start, end))
+            window_len += added_len
+
+        if window:
+            self.__windows.append(window)
+
+        self.__segment_count = len(self.__windows)
+
+    # Get Window Audio (Join regions with gaps)
+    def __get_window(self, index):
+        gap = np.zeros(self.__hop_len, dtype=np.float32)
+        parts = []
+        for start, end in self.__windows[index]:
+            if parts:
+                parts.append(gap)
+            parts.append(self.__source_audio[start:end])
+        return np.concatenate(parts)
+
+    # Map Window Position to Source Position (Positions in gaps snap to nearest region)
+    def __source_position(self, index, window_position, is_end):
+        regions = self.__windows[index]
+        offsets = [0]
+        for start, end in regions[:-1]:
+            offsets.append(offsets[-1] + end - start + self.__hop_len)
+
+        region = max(0, int(np.searchsorted(offsets, window_position, side='right')) - 1)
+        start, end = regions[region]
+        mapped = start + window_position - offsets[region]
+        if mapped > end:
+            if is_end or region + 1 == len(regions):
+                return end
+            return regions[region + 1][0]
+        return mapped
+
+    # Window Recognition (Recognise packed window and map segments back to source timeline)
+    def __window_recognition(self, index, transcribed: dict):
+        for segment in transcribed['segments']:
+            segment_start = self.__source_position(index, round(segment['start'] * self.__sample_rate), False)
+            segment_end = self.__source_position(index, round(segment['end'] * self.__sample_rate), True)
+
+            self.__append_segment(segment_start, max(segment_start, segment_end), segment['text'].strip())
+
+            # Print if Required
+            if self.print_msg:
+                print("Transcribed:", segment['text'].strip())
+
+        self.__complete_count += 1
+
+    # Get Audio Clip (View of source audio, already at model sample rate)
+    def __get_clip(self, index):
+        start, end = self.__clips[index]
+        return self.__source_audio[start:end]
+
+    # File Recognition
+    def __file_recognition(self, audio: Union[pathlib.Path, np.ndarray, None], index, auto_split=True,
+                           transcribed: Optional[dict] = None):
+        # Transcribe (Pass arrays directly, paths as string), unless already transcribed by worker
+        if transcribed is None:
+            if not isinstance(audio, np.ndarray):
+                audio = str(audio)
+            transcribed = self.__get_transcriber().transcribe(audio, auto_split, **self.__decode_options())
+
+        # If more than one sentence (Or full recognition), split
+        if auto_split and (len(transcribed['segments']) > 1 or index == -1):
+            if index > -1:
+                # Get timecode for transcribing audio clip
+                first_start, last_end = self.__regions[index]
 
             # Else is full recognition
             else:
-                first_index = 0
                 first_start = 0
                 last_end = -1
 
             # Loop to get each segment
             for segment in transcribed['segments']:
                 # Get segment timeframe
-                current_id = first_index + segment['id']
                 segment_start = first_start + round(segment['start'] * self.__sample_rate)
                 segment_end = first_start + round(segment['end'] * self.__sample_rate)
 
@@ -186,69 +481,299 @@ class Transcribe:
                     segment_end = last_end
 
                 # Append Timecode and Caption
-                self.__timestamps.insert(current_id, {'start': segment_start, 'end': segment_end})
-                transcribed_list.append(segment['text'].strip())
+                self.__append_segment(segment_start, segment_end, segment['text'].strip())
 
                 # Print if Required
                 if self.print_msg:
                     print("Transcribed:", segment['text'].strip())
 
-            return transcribed_list
-
         else:
+            # Append Timecode of Audio Clip and Caption
+            start, end = self.__regions[index]
+            self.__append_segment(start, end, transcribed['text'].strip())
+
             # Print if Required
             if self.print_msg:
                 print("Transcribed:", transcribed['text'].strip())
 
-            return transcribed['text'].strip()
+    # Append Segment (Written to output immediately)
+    def __append_segment(self, start, end, caption):
+        self.__segments.append(start, end, caption)
+        if self.__writer is not None:
+            self.__writer.write(start / self.__sample_rate, end / self.__sample_rate, caption)
+
+    # Recognise Clip and Append Captions
+    def __recognise_clip(self, index, transcribed: dict):
+        # Call for Recognition
+        self.__file_recognition(None, index, transcribed=transcribed)
+        self.__complete_count += 1
+
+    # Get Segment Audio (Packed window or clip)
+    def __segment_audio(self, index):
+        if self.pack:
+            return self.__get_window(index)
+        return self.__get_clip(index)
+
+    # Measure Real Time Factor (Time used over audio duration)
+    def __measure_speed(self):
+        if self.__source_audio is not None:
+            duration = len(self.__source_audio) / Transcriber.sample_rate
+        else:
+            duration = self.__total_frames / self.__sample_rate
+        if duration > 0:
+            self.real_time_factor = self.__last_time_used / duration
+
+    # region Language
+    # Detect Language of Speech Sample (In worker process if executor given)
+    def __detect_language(self, audio: np.ndarray, executor: Optional[ProcessPoolExecutor] = None):
+        if len(audio) == 0:
+            return
+        if executor is None:
+            self.__language = self.__get_transcriber().detect_language(audio[:self.__detect_len])
+        else:
+            self.__language = executor.submit(_worker_detect_language, audio[:self.__detect_len]).result()
+        print("Detected Language: {}".format(self.__language))
+
+    # Get Speech Sample (Speech regions from start, up to detection length)
+    def __speech_sample(self):
+        parts = []
+        sample_len = 0
+        for start, end in self.__regions:
+            if sample_len >= self.__detect_len:
+                break
+            parts.append(self.__source_audio[start:end])
+            sample_len += end - start
+        if not parts:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(parts)
+
+    # Decoding Options of Every Segment
+    def __decode_options(self):
+        if self.__language is None:
+            return {'profile': self.__profile}
+        return {'profile': self.__profile, 'language': self.__language}
+    # endregion
 
-    # Speech Recognition - Splitting
-    def speech_recognition_split(self):
-        try:
-            # Initialise
-            self.completed = False
-            self.__captions = []
-            self.cancel = False
+    # Segment Fingerprint (Hash of quantized samples under current model and language)
+    def __segment_key(self, audio: np.ndarray):
+        if self.__segment_cache is None:
+            return None
+        quantized = np.round(audio * 4096).astype(np.int16)
+        return ResultCache.make_key(hashlib.sha256(quantized.data).hexdigest(), self.__model_tag, self.__language)
+
+    # Get Cached Segment Result
+    def __cached_segment(self, key):
+        if key is None:
+            return None
+        transcribed = self.__segment_cache.get(key)
+        if transcribed is not None:
+            self.__reused_count += 1
+        return transcribed
+
+    # Save Segment Result into Cache
+    def __cache_segment(self, key, transcribed: dict, redecoded=False):
+        self.__decoded_count += 1
+        if redecoded:
+            self.__redecoded_count += 1
+        if key is not None:
+            self.__segment_cache.put(key, {
+                'text': transcribed['text'],
+                'segments': [{'id': segment['id'], 'start': segment['start'], 'end': segment['end'],
+                              'text': segment['text']} for segment in transcribed['segments']]
+            })
+
+    # Transcribe Segment Audio (Reuse cached result of identical segment)
+    def __transcribe_segment(self, audio: np.ndarray):
+        key = self.__segment_key(audio)
+        transcribed = self.__cached_segment(key)
+        if transcribed is None:
+            if self.__cascade is None:
+                transcribed, redecoded = self.__get_transcriber().transcribe(audio, True,
+                                                                             **self.__decode_options()), False
+            else:
+                transcribed, redecoded = _cascade_transcribe(self.__get_fast_transcriber(), self.__get_transcriber(),
+                                                             audio, *self.__cascade[2:], **self.__decode_options())
+            self.__cache_segment(key, transcribed, redecoded)
+        return transcribed
+
+    # Recognise Segment (Transcribe here if not transcribed by worker)
+    def __recognise_segment(self, index, transcribed: Optional[dict] = None):
+        if transcribed is None:
+            transcribed = self.__transcribe_segment(self.__segment_audio(index))
+
+        first_row = len(self.__segments)
+        if self.pack:
+            self.__window_recognition(index, transcribed)
+        else:
+            self.__recognise_clip(index, transcribed)
+        self.__record_segment(index, first_row)
 
-            # Split Audio
-            self.__split_audio()
+        # Add Progress
+        self.__set_progress(round(self.__complete_count / self.__segment_count, 2))
 
-            # Performance Timer
-            start_time = time.perf_counter()
+    # Parallel Recognition (Transcribe in worker processes, merge results in index order)
+    def __parallel_recognition(self):
+        threads = self.worker_threads or max(1, (os.cpu_count() or 1) // self.workers)
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(self.__model_name, self.__device, threads, self.__cascade))
+        futures = {}
+        next_submit = 0
 
-            # Loop to call file recognition
-            for index in range(1, self.__segment_count + 1):  # (+ 1) to include last one
+        try:
+            # Detect Language once for all segments (Parent loads no model)
+            if self.__language is None:
+                self.__detect_language(self.__speech_sample(), executor)
+
+            for index in range(self.__segment_count):
                 if self.cancel:
                     break
 
-                # Call for Recognition
-                audio_clip = FileOperations.filename_combiner(self.__temp_path, self.__filename, 'wav', suffix=index)
-                transcribed = self.__file_recognition(audio_clip, index-1)
+                # Skip segments completed in previous run
+                if self.__resume_segment(index):
+                    continue
+
+                # Keep a bounded number of segments in flight (Cached and completed segments are not submitted)
+                while next_submit < self.__segment_count and next_submit < index + self.workers * 2:
+                    if next_submit in self.__journal.completed:
+                        next_submit += 1
+                        continue
+
+                    audio = self.__segment_audio(next_submit)
+                    key = self.__segment_key(audio)
+                    transcribed = self.__cached_segment(key)
+                    if transcribed is None:
+                        future = executor.submit(_worker_transcribe, audio, self.__decode_options())
+                        futures[next_submit] = (future, key)
+                    else:
+                        futures[next_submit] = (None, transcribed)
+                    next_submit += 1
+
+                # Wait for result, check for cancel while waiting
+                future, key = futures.pop(index)
+                if future is None:
+                    transcribed = key
+                else:
+                    while not self.cancel:
+                        try:
+                            transcribed, redecoded = future.result(timeout=0.5)
+                            break
+                        except TimeoutError:
+                            continue
+                    else:
+                        break
+                    self.__cache_segment(key, transcribed, redecoded)
+
+                self.__recognise_segment(index, transcribed)
+
+        finally:
+            for future, _ in futures.values():
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=not self.cancel)
 
-                # Append Captions
-                if type(transcribed) is list:
-                    self.__captions += transcribed
+    # Speech Recognition - Splitting
+    def speech_recognition_split(self):
+        try:
+            # Initialise
+            self.completed = False
+            self.__segments.clear()
+
+            # Check Cache (Loads audio first if not streaming)
+            if self.stream:
+                job_key = self.__job_key("stream")
+            else:
+                self.__load_audio()
+                job_key = self.__job_key("split_pack_{}".format(self.__window_len) if self.pack else "split")
+
+            if self.__load_cache(job_key):
+                self.__write_output("Split Recognition")
+                self.__set_progress(1)
+                self.completed = True
+                return
+            self.__open_output()
+            self.__open_journal(job_key)
+
+            # Streaming, Recognise regions while reading source
+            if self.stream:
+                # Performance Timer
+                start_time = time.perf_counter()
+                self.__regions = []
+
+                for index, (start, end) in enumerate(self.__stream_split_audio()):
+                    if self.cancel:
+                        break
+
+                    # Record Speech Region
+                    self.__regions.append((start, end))
+                    self.__segment_count += 1
+
+                    # Call for Recognition (Unless completed in previous run)
+                    if not self.__resume_segment(index):
+                        clip = self.__read_clip(start, end)
+                        if self.__language is None:
+                            self.__detect_language(clip)
+
+                        first_row = len(self.__segments)
+                        self.__recognise_clip(index, self.__transcribe_segment(clip))
+                        self.__record_segment(index, first_row)
+
+                    # Add Progress (By position in source)
+                    self.__set_progress(round(end / self.__total_frames, 2))
+
+            else:
+                # Split Audio (Reuse segmentation of previous run)
+                if self.__journal.split is not None:
+                    self.__regions = [tuple(region) for region in self.__journal.split['regions']]
+                    self.__clips = [tuple(clip) for clip in self.__journal.split['clips']]
+                    self.__segment_count = len(self.__regions)
                 else:
-                    self.__captions.append(transcribed)
+                    self.__split_audio()
+                    if self.speech_filter:
+                        self.__filter_regions()
+                    self.__journal.write_split(self.__regions, self.__clips)
+                if self.pack:
+                    self.__pack_clips()
+
+                # Detect Language once for all segments (Parallel recognition detects in worker)
+                if self.__language is None and self.workers <= 1:
+                    self.__detect_language(self.__speech_sample())
+
+                # Performance Timer
+                start_time = time.perf_counter()
+
+                # Loop to call file recognition
+                if self.workers > 1:
+                    self.__parallel_recognition()
+                else:
+                    for index in range(1, self.__segment_count + 1):  # (+ 1) to include last one
+                        if self.cancel:
+                            break
 
-                # Add Progress
-                self.__complete_count += 1
-                self.progress = round(self.__complete_count / self.__segment_count, 2)
+                        # Call for Recognition (Unless completed in previous run)
+                        if not self.__resume_segment(index-1):
+                            self.__recognise_segment(index-1)
 
             # Calculate Time Used
             self.__last_time_used = time.perf_counter() - start_time
             print("Time Used: {0:.2f} seconds".format(self.__last_time_used))
+            self.__measure_speed()
 
-            # Write Output
+            # Write Output (Journal kept for resume if cancelled)
             if not self.cancel:
-                self.text_output = FileOperations.absolute_path(self.__output_text())
-                self.caption_output = FileOperations.absolute_path(self.__output_caption())
-                self.__output_log("Full Recognition", self.text_output, self.caption_output)
+                self.__save_cache(job_key)
+                self.__write_output("Split Recognition")
+                self.__journal.remove()
+            else:
+                self.__discard_output()
+                self.__journal.close()
             self.completed = True
 
         except FileNotFoundError as exc:
             self.exception = exc
             raise exc
+
+        finally:
+            self.__release_output()
     # endregion
 
     # region Full Recognition
@@ -256,8 +781,17 @@ class Transcribe:
         try:
             # Initialise
             self.completed = False
-            self.__captions = []
-            self.cancel = False
+            self.__segments.clear()
+
+            # Load Audio and Check Cache
+            self.__load_audio()
+            job_key = self.__job_key("full")
+            if self.__load_cache(job_key):
+                self.__write_output("Full Recognition")
+                self.__set_progress(1)
+                self.completed = True
+                return
+            self.__open_output()
 
             # Performance Timer
             start_time = time.perf_counter()
@@ -265,81 +799,159 @@ class Transcribe:
             # Run only if not cancelled
             if not self.cancel:
                 # Call for Recognition
-                transcribed = self.__file_recognition(self.__source, -1)
-
-                # Fetch Captions
-                self.__captions.append(transcribed)
+                self.__file_recognition(self.__source_audio, -1)
 
             # Calculate Time Used
             self.__last_time_used = time.perf_counter() - start_time
             print("Time Used: {0:.2f} seconds".format(self.__last_time_used))
+            self.__measure_speed()
 
             if not self.cancel:
                 # Write Output
-                self.text_output = FileOperations.absolute_path(self.__output_text())
-                self.caption_output = FileOperations.absolute_path(self.__output_caption())
-                self.__output_log("Full Recognition", self.text_output, self.caption_output)
+                self.__save_cache(job_key)
+                self.__write_output("Full Recognition")
+            else:
+                self.__discard_output()
             self.completed = True
 
         except FileNotFoundError as exc:
             print("File Not Found!", exc.filename)
-    # endregion
-
-    # region Output
-    # Write Caption Text
-    def __output_text(self):
-        try:
-            # Print
-            if self.print_msg:
-                print('\n'.join(self.__captions))
 
-            # Write to file
-            destination_file = FileOperations.filename_combiner(self.__des_path, self.__filename, "txt")
-            FileOperations.check_directory(self.__des_path)
-            if self.__captions:
-                with open(destination_file, 'w', encoding='utf-8') as file:
-                    file.write('\n'.join(self.__captions))
-
-            return destination_file
+        finally:
+            self.__release_output()
+    # endregion
 
-        except FileNotFoundError as exc:
-            print("File Not Found!", exc.filename)
+    # region Cache
+    # Hash Audio (Decoded audio if loaded, else file fingerprint)
+    def __audio_hash(self, block_size=1024*1024):
+        hasher = hashlib.sha256()
 
-    # Write Timecode
-    def __output_caption(self):
-        caption_srt = []
-        caption_line = 1
+        # Loaded audio
+        if self.__source_audio is not None:
+            hasher.update(self.__source_audio.data)
 
-        if self.__captions:
-            try:
-                # Loop over all timestamps and caption
-                for index, value in enumerate(self.__timestamps):
-                    # Write only if there is caption in the timestamp
-                    if self.__captions[index] != "" and self.__captions[index] != "......":
-                        # Get Timecodes
-                        start, end = value.values()
-                        start_h, start_m, start_s, start_ms = self.timecode_converter(start / self.__sample_rate)
-                        end_h, end_m, end_s, end_ms = self.timecode_converter(end / self.__sample_rate)
+        # Streaming, Fingerprint of file size, modified time, first and last blocks (Source is not read twice)
+        else:
+            if not self.__source.is_file():
+                raise FileNotFoundError(errno.ENOENT, "File Not Found", str(self.__source))
+            stat = self.__source.stat()
+            hasher.update("{0}|{1}".format(stat.st_size, stat.st_mtime_ns).encode('utf-8'))
+            with open(self.__source, 'rb') as file:
+                hasher.update(file.read(block_size))
+                file.seek(max(0, stat.st_size - block_size))
+                hasher.update(file.read(block_size))
+
+        return hasher.hexdigest()
+
+    # Get Job Key (Decoded audio, model and recognition settings)
+    def __job_key(self, mode):
+        # Detected language depends on sample length
+        language = self.__language if self.__language_given else "detect_{}".format(self.__detect_len)
+        speech_filter = json.dumps(self.__filter_thresholds, sort_keys=True) if self.speech_filter else None
+        return ResultCache.make_key(self.__audio_hash(), self.__model_tag, mode, self.__bg_db, language,
+                                    speech_filter)
+
+    # Load Result from Cache
+    def __load_cache(self, key):
+        if self.__cache is None:
+            return False
+
+        cached = self.__cache.get(key)
+        if cached is None:
+            return False
+
+        self.__segments.clear()
+        for caption, (start, end) in zip(cached['captions'], cached['timestamps']):
+            self.__segments.append(start, end, caption)
+        self.__sample_rate = cached['sample_rate']
+        self.__cache_hit = True
+        print("Loaded from Cache!")
+        return True
+
+    # Save Result into Cache
+    def __save_cache(self, key):
+        if self.__cache is None or self.cancel:
+            return
+
+        self.__cache.put(key, {
+            'captions': self.__segments.captions.tolist(),
+            'timestamps': np.stack([self.__segments.starts, self.__segments.ends], axis=1).tolist(),
+            'sample_rate': self.__sample_rate
+        })
+    # endregion
 
-                        timecode = "{0:02d}:{1:02d}:{2:02d},{3:03d} --> {4:02d}:{5:02d}:{6:02d},{7:03d}".format(
-                            start_h, start_m, start_s, start_ms, end_h, end_m, end_s, end_ms)
+    # region Journal
+    # Open Journal of Job (Beside temp files)
+    def __open_journal(self, key):
+        journal_file = FileOperations.filename_combiner(self.__temp_path, self.__filename, "journal", suffix=key[:16])
+        self.__journal = SegmentJournal(journal_file)
+        if self.__journal.completed:
+            print("Resuming from Segment Journal...")
+
+    # Resume Segment Completed in Previous Run
+    def __resume_segment(self, index):
+        rows = self.__journal.completed.get(index)
+        if rows is None:
+            return False
+
+        for start, end, caption in rows:
+            self.__append_segment(start, end, caption)
+        self.__complete_count += 1
+        self.__resumed_count += 1
+        self.__set_progress(round(self.__complete_count / max(1, self.__segment_count), 2))
+        return True
+
+    # Record Completed Segment (Rows appended since first row)
+    def __record_segment(self, index, first_row):
+        rows = list(zip(self.__segments.starts[first_row:].tolist(), self.__segments.ends[first_row:].tolist(),
+                        self.__segments.captions[first_row:].tolist()))
+        self.__journal.write_segment(index, rows)
+    # endregion
 
-                        # Join Caption
-                        caption_message = "{0}\n{1}\n{2}\n".format(caption_line, timecode, self.__captions[index])
-                        caption_srt.append(caption_message)
+    # region Output
+    # Open Output Files (Partial output until completed)
+    def __open_output(self):
+        FileOperations.check_directory(self.__des_path)
+        self.__writer = CaptionWriter(FileOperations.filename_combiner(self.__des_path, self.__filename, "txt"),
+                                      FileOperations.filename_combiner(self.__des_path, self.__filename, "srt"))
+
+    # Write Output Files
+    def __write_output(self, recognition_type):
+        try:
+            # Write all segments if not written during recognition (Loaded from cache)
+            if self.__writer is None:
+                self.__open_output()
+                for start, end, caption in self.__segments:
+                    self.__writer.write(start / self.__sample_rate, end / self.__sample_rate, caption)
+
+            # Rename partial output to destination (Nothing written if no segment)
+            self.__writer.close()
+            if self.__writer.line_count > 0:
+                self.text_output = self.__writer.text_file
+                self.caption_output = self.__writer.caption_file
+            else:
+                self.text_output = None
+                self.caption_output = None
+            self.__writer = None
 
-                        caption_line += 1
+            self.__output_log(recognition_type, self.text_output, self.caption_output)
 
-                # Write Caption
-                destination_file = FileOperations.filename_combiner(self.__des_path, self.__filename, "srt")
-                FileOperations.check_directory(self.__des_path)
-                with open(destination_file, 'w', encoding='utf-8') as file:
-                    file.write('\n'.join(caption_srt))
+        except FileNotFoundError as exc:
+            print("File Not Found!", exc.filename)
 
-                return destination_file
+    # Discard Partial Output
+    def __discard_output(self):
+        if self.__writer is not None:
+            self.__writer.discard()
+            self.__writer = None
 
-            except FileNotFoundError as exc:
-                print("File Not Found!", exc.filename)
+    # Release Output and Journal of Aborted Run (Partial output and journal kept, discarded only on cancel)
+    def __release_output(self):
+        if self.__writer is not None:
+            self.__writer.close_partial()
+            self.__writer = None
+        if self.__journal is not None:
+            self.__journal.close()
 
     # Write Log
     def __output_log(self, recognition_type, text_destination, caption_destination):
@@ -349,6 +961,28 @@ class Transcribe:
         self.__log.append("Destination (Text): {}".format(text_destination))
         self.__log.append("Destination (Caption): {}".format(caption_destination))
         self.__log.append("Time Used: {:.2f} seconds".format(self.__last_time_used))
+        if self.real_time_factor is not None:
+            self.__log.append("Profile: {0}, Real Time Factor: {1:.3f}".format(self.__profile.capitalize(),
+                                                                               self.real_time_factor))
+        if self.__language is not None:
+            self.__log.append("Language: {0} ({1})".format(self.__language,
+                                                           "Given" if self.__language_given else "Detected"))
+        if self.__cache is not None:
+            self.__log.append("Cache: {0} (Hit Rate: {1:.2%})".format("Hit" if self.__cache_hit else "Miss",
+                                                                      self.__cache.hit_rate))
+            if not self.__cache_hit:
+                self.__log.append("Segments: {0} Reused, {1} Decoded".format(self.__reused_count,
+                                                                            self.__decoded_count))
+            self.__cache.save_stats()
+            self.__segment_cache.save_stats()
+        if self.__resumed_count:
+            self.__log.append("Resumed: {} Segments".format(self.__resumed_count))
+        if self.__filtered_count is not None:
+            self.__log.append("Speech Filter: {0}/{1} Regions Dropped".format(
+                self.__filtered_count, self.__filtered_count + len(self.__regions)))
+        if self.__cascade is not None and self.__decoded_count:
+            self.__log.append("Cascade Re-decoded: {0}/{1} Segments ({2:.2%})".format(
+                self.__redecoded_count, self.__decoded_count, self.__redecoded_count / self.__decoded_count))
 
         FileOperations.output_log("Speech Recognition", self.__log, self.__log_path)
     # endregion
@@ -1,6 +1,9 @@
-import pickle
+import threading
+from collections import OrderedDict
 import numpy as np
+import torch
 from typing import Union
+import ModelWeights
 
 
 class Transcriber:
@@ -9,20 +12,112 @@ class Transcriber:
     }
     device_choice = {
         "gpu": "_gpu",
-        "cpu": "_cpu"
+        "cpu": "_cpu",
+        "cpu_int8": "_cpu"  # CPU model, Linear layers quantized to int8 on load
     }
+    quantized_choice = ("cpu_int8",)
+    profile_choice = {
+        # Model defaults (Temperature fallback on failed decodes)
+        "balanced": {},
+        # Greedy, no temperature fallback, tokens capped, no prompt from previous window
+        "fast": {"temperature": 0.0, "beam_size": None, "best_of": None, "sample_len": 112,
+                 "condition_on_previous_text": False},
+        # Beam search, temperature fallback
+        "accurate": {"beam_size": 5, "best_of": 5, "patience": 1.0}
+    }
+    sample_rate = 16000  # Sample rate expected by model for audio arrays
+
+    @staticmethod
+    def default_device() -> str:
+        """ GPU if available, else CPU """
+        return "gpu" if torch.cuda.is_available() else "cpu"
 
     def __init__(self, model_choice="English", device_choice="gpu"):
-        with open(self.model_choice[model_choice].format(self.device_choice[device_choice.lower()]), 'rb') as file:
-            self.__model = pickle.load(file)
-            self.result = ""
-            self.completed = False
+        # Load converted weights (Memory mapped) if available, else pickled model
+        model_file = self.model_choice[model_choice].format(self.device_choice[device_choice.lower()])
+        self.__model = ModelWeights.load_model(model_file, "cuda" if device_choice.lower() == "gpu" else "cpu")
 
-    def transcribe(self, audio: Union[str, np.ndarray], show_all=False):
+        # Dynamic int8 quantization
+        if device_choice.lower() in self.quantized_choice:
+            self.__model = ModelWeights.quantize_dynamic(self.__model)
+        self.result = ""
         self.completed = False
-        self.result = self.__model.transcribe(audio)
+
+    def transcribe(self, audio: Union[str, np.ndarray], show_all=False, profile="balanced", **options):
+        """ Transcribe audio with decoding profile, options (Such as language) override profile """
+        self.completed = False
+        result = self.__model.transcribe(audio, **{**self.profile_choice[profile.lower()], **options})
+        self.result = result  # Last result only, concurrent jobs use returned result
         self.completed = True
         if show_all:
-            return self.result
+            return result
         else:
-            return self.result["text"].strip()
+            return result["text"].strip()
+
+    def detect_language(self, audio: np.ndarray) -> str:
+        """ Detect spoken language of audio (First 30 seconds), return language code """
+        # English only model
+        if not self.__model.is_multilingual:
+            return "en"
+
+        from whisper.audio import log_mel_spectrogram, pad_or_trim
+        mel = log_mel_spectrogram(pad_or_trim(audio), self.__model.dims.n_mels).to(self.__model.device)
+        _, probs = self.__model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+
+# region Model Registry
+# Loaded transcribers shared across jobs, keyed by (model, device, slot), least recently used evicted first.
+# A Whisper model decodes one audio at a time (Decoding installs hooks on shared modules),
+# so each concurrent job uses its own slot, limit counts distinct (model, device)
+MAX_LOADED_MODELS = 2
+_loaded_models = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def get_transcriber(model_choice="English", device_choice="gpu", slot=0) -> Transcriber:
+    key = (model_choice, device_choice.lower(), slot)
+    with _registry_lock:
+        # Reuse loaded model
+        if key in _loaded_models:
+            _loaded_models.move_to_end(key)
+            return _loaded_models[key]
+
+    # Load model outside lock (Slots of concurrent jobs load together)
+    transcriber = Transcriber(*key[:2])
+
+    with _registry_lock:
+        # Keep model loaded by another thread meanwhile
+        if key in _loaded_models:
+            _loaded_models.move_to_end(key)
+            return _loaded_models[key]
+
+        # Register model, evict least recently used choice (All slots) if exceed limit
+        _loaded_models[key] = transcriber
+        while len({loaded[:2] for loaded in _loaded_models}) > MAX_LOADED_MODELS:
+            oldest = next(iter(_loaded_models))[:2]
+            for loaded in [loaded for loaded in _loaded_models if loaded[:2] == oldest]:
+                _loaded_models.pop(loaded)
+
+        return transcriber
+
+
+def loaded_models() -> list:
+    """ Keys (Model, Device, Slot) of loaded models, least recently used first """
+    with _registry_lock:
+        return list(_loaded_models.keys())
+
+
+def unload(model_choice=None, device_choice=None, slot=None) -> None:
+    """ Unload models of given choice and slot from registry, or all models if nothing given """
+    with _registry_lock:
+        for key in list(_loaded_models.keys()):
+            if (model_choice is None or key[0] == model_choice) and \
+                    (device_choice is None or key[1] == device_choice.lower()) and \
+                    (slot is None or key[2] == slot):
+                _loaded_models.pop(key)
+
+    # Return freed memory of unloaded GPU models
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+# endregion
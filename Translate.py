@@ -1,8 +1,9 @@
 import pathlib
-from typing import Optional
+from typing import Callable, Optional
 import httpcore
 from googletrans import Translator
 from ModelTranslator import ModelTranslator
+from TranslationMemory import TranslationMemory
 import FileOperations
 
 # Constant Language Code - {Language Name: Language Code}
@@ -41,12 +42,14 @@ class Translate:
     exception: Optional[Exception]
     output: pathlib.Path
     cancel: bool
+    progress_callback: Optional[Callable[[], None]]
     # endregion
 
     # region Initialise
     def __init__(self, source: pathlib.Path, destination: pathlib.Path = None,
                  log_path: pathlib.Path = pathlib.Path("logs"), src_language='Auto', des_language="English",
-                 model_translator=True, model_name="English-Malay"):
+                 model_translator=True, model_name="English-Malay", batch_size=16, token_budget=2048,
+                 chunk_size=256, memory_path: Optional[pathlib.Path] = pathlib.Path("cache\\translation.db")):
         # File
         self.__source = FileOperations.absolute_path(source)
         self.__filepath, self.__filename, self.__filetype = FileOperations.filename_separator(self.__source)
@@ -61,8 +64,9 @@ class Translate:
         self.__src_language = LANG_CHOICES[src_language]
         self.__des_language = LANG_CHOICES[des_language]
         self.__model_translator = model_translator
+        self.__model_name = model_name if model_translator else "googletrans"
         if model_translator:
-            self.__translator = ModelTranslator(model_name)
+            self.__translator = ModelTranslator(model_name, batch_size, token_budget)
             des_language = model_name.split('-')[1]
             if ' ' in des_language:
                 des_language = des_language[:des_language.index(' ')]
@@ -75,18 +79,38 @@ class Translate:
         self.__translated = []
         self.__text_count = 0
         self.__completed_count = 0
+        self.__chunk_size = chunk_size  # Lines sent to model together (Batched by model, progress by chunk)
+
+        # Translation Memory (Disabled if no path given, opened in translating thread)
+        self.__memory_path = memory_path
+        self.__memory = None
+        self.__memory_hits = 0
+        self.__memory_misses = 0
+
+        # Text lines, and distinct text lines sent to translator
+        self.__line_count = 0
+        self.__unique_count = 0
 
         # Public Properties
         self.percentage = 0
         self.completed = False
         self.exception = None
         self.output = FileOperations.filename_combiner(self.__des_path, self.__filename, self.__filetype, des_language)
+        self.cancel = False
+        self.progress_callback = None  # Called in job thread when progress changes
     # endregion
 
     # Cancel
     def cancel_translate(self):
         self.cancel = True
 
+    # Set Progress (Notify callback if changed)
+    def __set_percentage(self, percentage):
+        if percentage != self.percentage:
+            self.percentage = percentage
+            if self.progress_callback is not None:
+                self.progress_callback()
+
     # region Read File
     # Read Source File for Texts
     def __read_text(self):
@@ -104,42 +128,73 @@ class Translate:
     # endregion
 
     # region Translate (Backend)
+    # Translate Sentences by Backend (Reuse translation memory)
+    def __translate_sentences(self, sentences: list) -> list:
+        # Model translates by its own language pair, so model entries are keyed by model name only
+        if self.__model_translator:
+            key = ("model", self.__model_name, "", "")
+        else:
+            key = ("google", self.__model_name, self.__src_language, self.__des_language)
+        stored = {} if self.__memory is None else self.__memory.get(*key, sentences)
+        missing = [sentence for sentence in sentences if sentence not in stored]
+        self.__memory_hits += len(sentences) - len(missing)
+        self.__memory_misses += len(missing)
+
+        # Translate missing sentences
+        if missing:
+            if self.__model_translator:
+                translated = self.__translator.translate(missing)
+            else:
+                translated = [self.__translator.translate(sentence, src=self.__src_language,
+                                                          dest=self.__des_language).text for sentence in missing]
+            translated = dict(zip(missing, translated))
+            if self.__memory is not None:
+                self.__memory.put(*key, translated)
+            stored.update(translated)
+
+        return [stored[sentence] for sentence in sentences]
+
+    # Translate Lines in Chunks (Other lines copied)
+    def __translate_lines(self, indices: list):
+        # Model translates chunk in batches, Google line by line
+        chunk_size = self.__chunk_size if self.__model_translator else 1
+
+        # Each distinct line is translated once per file
+        unique = {}
+        self.__line_count = len(indices)
+
+        self.__translated = list(self.__source_text)
+        for start in range(0, len(indices), chunk_size):
+            # Stop if cancel
+            if self.cancel:
+                break
+
+            # Translate lines not seen in file
+            chunk = indices[start:start + chunk_size]
+            sentences = [sentence for sentence in dict.fromkeys(self.__source_text[index] for index in chunk)
+                         if sentence not in unique]
+            if sentences:
+                unique.update(zip(sentences, self.__translate_sentences(sentences)))
+
+            # Scatter to every position
+            for index in chunk:
+                self.__translated[index] = unique[self.__source_text[index]]
+            self.__unique_count = len(unique)
+
+            # Update Progress (By position in file)
+            self.__completed_count = chunk[-1] + 1
+            self.__set_percentage(round(self.__completed_count / self.__text_count, 2))
+
+        # Lines after last text line are copied
+        if not self.cancel:
+            self.__completed_count = self.__text_count
+            self.__set_percentage(1)
+
     # Translate TXT Files
     def __translate_txt(self):
         try:
-            # If Using Model, Call Model.Translate(Text)
-            if self.__model_translator:
-                for caption in self.__source_text:
-                    # Stop if cancel
-                    if self.cancel:
-                        break
-
-                    # Translate
-                    text = ""
-                    if caption:
-                        text = self.__translator.translate(caption)
-                    self.__translated.append(text)
-
-                    # Update Progress
-                    self.__completed_count += 1
-                    self.percentage = round(self.__completed_count / self.__text_count, 2)
-            else:
-                # Translate lines and append
-                for caption in self.__source_text:
-                    # Stop if cancel
-                    if self.cancel:
-                        break
-
-                    # Translate
-                    text = ""
-                    if caption:
-                        text = self.__translator.translate(caption, src=self.__src_language,
-                                                           dest=self.__des_language).text
-                    self.__translated.append(text)
-
-                    # Update Progress
-                    self.__completed_count += 1
-                    self.percentage = round(self.__completed_count / self.__text_count, 2)
+            # Translate all non empty lines
+            self.__translate_lines([index for index, caption in enumerate(self.__source_text) if caption])
         except httpcore.ReadTimeout as exc:
             self.exception = exc
             raise exc
@@ -154,65 +209,28 @@ class Translate:
         timecode = False
 
         try:
-            # If Using Model, Call Model.Translate(Text)
-            if self.__model_translator:
-                for i, caption in enumerate(self.__source_text):
-                    # Stop if cancel
-                    if self.cancel:
-                        break
-
-                    # Copy for Line Number (Don't translate)
-                    if not caption:
-                        self.__translated.append(caption)
-
-                    elif caption == str(index):
-                        self.__translated.append(caption)
-                        index += 1
-                        timecode = True
-
-                    # Copy for Timecode (Don't translate)
-                    elif timecode:
-                        self.__translated.append(caption)
-                        timecode = False
-
-                    # Translate for Text
-                    else:
-                        text = self.__translator.translate(caption)
-                        self.__translated.append(text)
-
-                    # Update Progress
-                    self.__completed_count += 1
-                    self.percentage = round(self.__completed_count / self.__text_count, 2)
-            else:
-                # Translate by lines
-                for i, caption in enumerate(self.__source_text):
-                    # Stop if cancel
-                    if self.cancel:
-                        break
-
-                    # Copy for Line Number (Don't translate)
-                    if not caption:
-                        self.__translated.append(caption)
-
-                    elif caption == str(index):
-                        self.__translated.append(caption)
-                        index += 1
-                        timecode = True
-
-                    # Copy for Timecode (Don't translate)
-                    elif timecode:
-                        self.__translated.append(caption)
-                        timecode = False
-
-                    # Translate for Text
-                    else:
-                        text = self.__translator.translate(caption, src=self.__src_language,
-                                                           dest=self.__des_language).text
-                        self.__translated.append(text)
-
-                    # Update Progress
-                    self.__completed_count = i
-                    self.percentage = round(self.__completed_count / self.__text_count, 2)
+            # Find text lines
+            text_lines = []
+            for i, caption in enumerate(self.__source_text):
+                # Don't translate empty line
+                if not caption:
+                    continue
+
+                # Don't translate Line Number
+                elif caption == str(index):
+                    index += 1
+                    timecode = True
+
+                # Don't translate Timecode
+                elif timecode:
+                    timecode = False
+
+                # Text
+                else:
+                    text_lines.append(i)
+
+            # Translate text lines
+            self.__translate_lines(text_lines)
         except httpcore.ReadTimeout as exc:
             self.exception = exc
             raise exc
@@ -224,22 +242,29 @@ class Translate:
     # region Translate
     # Call for Translations Depending on File Type
     def translate(self):
-        # Initialise
-        self.cancel = False
-
         # Read Text
         self.__read_text()
 
-        # Translate Text
-        if self.__filetype == 'txt':
-            self.__translate_txt()
-        elif self.__filetype == 'srt':
-            self.__translate_srt()
+        # Open Translation Memory
+        if self.__memory_path is not None:
+            self.__memory = TranslationMemory(self.__memory_path)
 
-        # Write Output
-        if not self.cancel:
-            self.__write_file()
-            self.__output_log()
+        try:
+            # Translate Text
+            if self.__filetype == 'txt':
+                self.__translate_txt()
+            elif self.__filetype == 'srt':
+                self.__translate_srt()
+
+            # Write Output
+            if not self.cancel:
+                self.__write_file()
+                self.__output_log()
+
+        finally:
+            if self.__memory is not None:
+                self.__memory.close()
+                self.__memory = None
 
         self.completed = True
     # endregion
@@ -262,6 +287,12 @@ class Translate:
         self.__log.append("Output: {}".format(self.output))
         self.__log.append("Source Language: {}".format(self.__src_language))
         self.__log.append("Language: {}".format(self.__des_language))
+        self.__log.append("Text Lines: {0} ({1} Distinct)".format(self.__line_count, self.__unique_count))
+        if self.__model_translator:
+            self.__log.append("Padding Waste: {:.2%}".format(self.__translator.padding_waste))
+        if self.__memory is not None:
+            self.__log.append("Translation Memory: {0} Hits, {1} Misses (Hit Rate: {2:.2%})".format(
+                self.__memory_hits, self.__memory_misses, self.__memory.hit_rate))
 
         FileOperations.output_log("Translation", self.__log, self.__log_path)
     # endregion
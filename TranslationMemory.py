@@ -0,0 +1,112 @@
+import pathlib
+import sqlite3
+import time
+import unicodedata
+from typing import Dict, List
+import FileOperations
+
+
+class TranslationMemory:
+    # region Properties
+    hits: int
+    misses: int
+    # endregion
+
+    # region Initialise
+    def __init__(self, path: pathlib.Path = pathlib.Path("cache\\translation.db"), max_entries=200000):
+        """
+        Translations stored in SQLite, keyed by backend, model name, languages and normalized sentence.
+        Least recently used entries are evicted above max entries
+        """
+        self.__path = FileOperations.absolute_path(path)
+        self.__max_entries = max_entries
+        FileOperations.check_directory(self.__path.parent)
+
+        self.__connection = sqlite3.connect(str(self.__path))
+        self.__connection.executescript("""
+            CREATE TABLE IF NOT EXISTS memory (
+                backend TEXT NOT NULL, model TEXT NOT NULL, src TEXT NOT NULL, dest TEXT NOT NULL,
+                sentence TEXT NOT NULL, translation TEXT NOT NULL, used REAL NOT NULL,
+                PRIMARY KEY (backend, model, src, dest, sentence));
+            CREATE INDEX IF NOT EXISTS memory_used ON memory (used);
+            CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+        self.__count = self.__connection.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+        # Statistics (Saved on close)
+        stats = dict(self.__connection.execute("SELECT name, value FROM stats").fetchall())
+        self.hits = stats.get('hits', 0)
+        self.misses = stats.get('misses', 0)
+    # endregion
+
+    # Normalize Sentence (Unicode form and whitespace)
+    @staticmethod
+    def normalize(sentence: str) -> str:
+        return ' '.join(unicodedata.normalize('NFC', sentence).split())
+
+    # Hit Rate
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # region Get and Put
+    # Get Stored Translations
+    def get(self, backend: str, model: str, src: str, dest: str, sentences: List[str]) -> Dict[str, str]:
+        """ Return stored translations of given sentences, keyed by sentence as given """
+        found = {}
+        keys = {}  # Normalized sentence to given sentences (Several may normalize alike)
+        for sentence in sentences:
+            keys.setdefault(self.normalize(sentence), []).append(sentence)
+        normalized = list(keys)
+        for start in range(0, len(normalized), 500):
+            part = normalized[start:start + 500]
+            rows = self.__connection.execute(
+                "SELECT sentence, translation FROM memory WHERE backend = ? AND model = ? AND src = ? AND dest = ? "
+                "AND sentence IN ({})".format(", ".join("?" * len(part))), [backend, model, src, dest] + part)
+            for sentence, translation in rows:
+                for given in keys[sentence]:
+                    found[given] = translation
+
+        # Touch used entries
+        if found:
+            now = time.time()
+            self.__connection.executemany(
+                "UPDATE memory SET used = ? WHERE backend = ? AND model = ? AND src = ? AND dest = ? AND sentence = ?",
+                [(now, backend, model, src, dest, sentence) for sentence in keys if keys[sentence][0] in found])
+            self.__connection.commit()
+
+        hits = sum(1 for sentence in sentences if sentence in found)
+        self.hits += hits
+        self.misses += len(sentences) - hits
+        return found
+
+    # Store Translations
+    def put(self, backend: str, model: str, src: str, dest: str, translations: Dict[str, str]) -> None:
+        now = time.time()
+        before = self.__connection.total_changes
+        self.__connection.executemany(
+            "INSERT OR IGNORE INTO memory (backend, model, src, dest, sentence, translation, used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(backend, model, src, dest, self.normalize(sentence), translation, now)
+             for sentence, translation in translations.items()])
+        self.__count += self.__connection.total_changes - before
+        self.__evict()
+        self.__connection.commit()
+
+    # Evict Least Recently Used (To 90% of limit, so not evicted on every put)
+    def __evict(self):
+        if self.__count <= self.__max_entries:
+            return
+        remove = self.__count - int(self.__max_entries * 0.9)
+        self.__connection.execute(
+            "DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory ORDER BY used LIMIT ?)", (remove,))
+        self.__count -= remove
+    # endregion
+
+    # Save Statistics and Close
+    def close(self) -> None:
+        self.__connection.executemany("INSERT OR REPLACE INTO stats (name, value) VALUES (?, ?)",
+                                      [('hits', self.hits), ('misses', self.misses)])
+        self.__connection.commit()
+        self.__connection.close()
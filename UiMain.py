@@ -411,10 +411,10 @@ class UiMain(QMainWindow):
             self.objGUI.btn_transcribe_transcribe.setEnabled(True)
             return
 
-        # Get Model
-        model = self.objGUI.cbo_transcribe_language.currentText()
+        # Get Model and Decoding Profile
+        model, profile = Transcribe.MODEL_CHOICES[self.objGUI.cbo_transcribe_language.currentText()]
 
-        self.__thread_start_transcribe(output_path, model)
+        self.__thread_start_transcribe(output_path, model, profile)
     # endregion
     # endregion
 
@@ -842,12 +842,12 @@ class UiMain(QMainWindow):
     # endregion
 
     # region Transcribe
-    def __thread_start_transcribe(self, output_path: Optional[Path], model: str):
+    def __thread_start_transcribe(self, output_path: Optional[Path], model: str, profile: str):
         # Call for Convert
         self.__initDir__()
         self.__transcribe_thread = ThreadTranscribe(self.__imported_files, output_path,
                                                     self.__SPLIT_PATH__, self.__LOG_PATH__,
-                                                    model=model)
+                                                    model=model, profile=profile)
         self.__transcribe_thread.sgn_lock.connect(self.__thread_lock_transcribe)
         self.__transcribe_thread.sgn_progress.connect(self.__thread_pgr_transcribe)
         self.__transcribe_thread.sgn_error.connect(lambda msg, title: Dialog.ErrorDialog(msg, title, self))
@@ -0,0 +1,35 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+whisper_model = pytest.importorskip("whisper.model")
+
+import ModelWeights
+
+
+# Tiny Whisper model, converted and loaded back through meta device build
+def test_load_converted_whisper_forward(tmp_path):
+    torch.manual_seed(0)
+    dims = whisper_model.ModelDimensions(n_mels=80, n_audio_ctx=8, n_audio_state=16, n_audio_head=2,
+                                         n_audio_layer=1, n_vocab=64, n_text_ctx=8, n_text_state=16,
+                                         n_text_head=2, n_text_layer=2)
+    model = whisper_model.Whisper(dims).eval()
+
+    # Positional embedding of decoder is created uninitialised, set every parameter so outputs are finite
+    with torch.no_grad():
+        for parameter in model.parameters():
+            parameter.normal_(std=0.1)
+    model_file = tmp_path / "tiny.model"
+    ModelWeights.save_weights(model, model_file)
+
+    loaded = ModelWeights.load_weights(model_file)
+    assert not any(tensor.is_meta for tensor in list(loaded.parameters()) + list(loaded.buffers()))
+
+    # One forward pass matches source model
+    mel = torch.randn(1, dims.n_mels, dims.n_audio_ctx * 2)
+    tokens = torch.tensor([[1, 2, 3]])
+    with torch.no_grad():
+        expected = model(mel, tokens)
+        actual = loaded(mel, tokens)
+    assert torch.isfinite(expected).all()
+    assert torch.allclose(actual, expected, atol=1e-5)
+    assert torch.equal(loaded.alignment_heads.to_dense(), model.alignment_heads.to_dense())